@@ -2,8 +2,146 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import os
+import sys
+import math
+import time
+import sqlite3
 from PIL import Image, ImageTk
 
+# Shared retained-mode widgets live one folder up, next to the app folders; the question
+# generator and the results store are the ones in ex1.py at the top of the repository
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(APP_DIR))
+sys.path.insert(1, os.path.dirname(os.path.dirname(APP_DIR)))
+from canvas_ui import CanvasUI
+from ex1 import generate_quizzes, quiz_questions, ResultsStore, default_player
+
+# ================== QUIZ ENGINE (NO TK) ==================
+class QuizEngine:
+    """
+    The quiz rules without any widgets: question generation, two attempts per
+    question (running out of time uses up an attempt), 10/5 point scoring and
+    grading. MathQuizApp only draws the engine's state, so the rules can be run
+    and checked without a window.
+    """
+    RANGES = {1: (0, 9), 2: (10, 99), 3: (1000, 9999)}
+    CORRECT, RETRY, WRONG = "correct", "retry", "wrong"
+
+    def __init__(self, total_questions=10):
+        self.total_questions = total_questions
+        self.seed = None
+        self.questions = []
+        self.difficulty = 0
+        self.score = 0
+        self.question_count = 0
+        self.current_attempt = 1
+        self.question_open = False   # True until the current question is answered or given up
+        self.attempts = []           # (question, attempt, answer, latency_ms); answer is None on a timeout
+        self.num1 = self.num2 = 0
+        self.operation = '+'
+        self.correct_answer = 0
+
+    def start(self, level, seed=None):
+        """Starts a quiz with all its questions generated from `seed`; the same seed replays the same quiz."""
+        self.difficulty = level
+        self.score = 0
+        self.question_count = 0
+        self.attempts = []
+        self.seed = random.getrandbits(63) if seed is None else seed
+        low, high = self.RANGES[level]
+        self.questions = quiz_questions(generate_quizzes(low, high, 1, self.total_questions, self.seed), 0)
+
+    def next_question(self):
+        """Sets up the next problem; returns False when the quiz is over."""
+        if self.question_count >= self.total_questions:
+            return False
+        self.question_count += 1
+        self.current_attempt = 1
+        self.question_open = True
+        self.num1, self.operation, self.num2, self.correct_answer = self.questions[self.question_count - 1]
+        return True
+
+    def isCorrect(self, user_answer, latency_ms=None):
+        """Scores one attempt: (CORRECT, 10 or 5), (RETRY, 0) after a first miss, (WRONG, 0) after a second."""
+        self.attempts.append((self.question_count, self.current_attempt, user_answer, latency_ms))
+        if user_answer == self.correct_answer:
+            points = 10 if self.current_attempt == 1 else 5
+            self.score += points
+            self.question_open = False
+            return self.CORRECT, points
+        if self.current_attempt == 1:
+            self.current_attempt = 2
+            return self.RETRY, 0
+        self.question_open = False
+        return self.WRONG, 0
+
+    def timeout(self, latency_ms=None):
+        """Running out of time counts as a missed attempt."""
+        return self.isCorrect(None, latency_ms)
+
+    def average_latency(self):
+        """Mean response time of the answers actually given (timeouts are left out)."""
+        latencies = [ms for _, _, answer, ms in self.attempts if answer is not None and ms is not None]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    def grade(self):
+        if self.score > 90: return "A+"
+        elif self.score > 80: return "A"
+        elif self.score > 70: return "B"
+        elif self.score > 60: return "C"
+        return "F"
+
+# ================== QUESTION CLOCK ==================
+class QuestionClock:
+    """
+    Countdown for one answer attempt, measured against a time.monotonic() deadline.
+    The display is redrawn when the whole number of seconds left changes, with each
+    callback scheduled from the clock rather than from the previous callback, so
+    late callbacks never add up. Answers are judged against the deadline itself,
+    not against whether the timeout callback has run yet.
+    """
+    def __init__(self, root, on_tick, on_timeout):
+        self.root = root
+        self.on_tick, self.on_timeout = on_tick, on_timeout
+        self.started = self.deadline = None
+        self.after_id = None
+
+    def start(self, seconds):
+        self.stop()
+        self.started = time.monotonic()
+        self.deadline = self.started + seconds
+        self.tick()
+
+    def stop(self):
+        if self.after_id:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def expired(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def elapsed_ms(self):
+        """Milliseconds since the attempt started (the answer's response time)."""
+        return round((time.monotonic() - self.started) * 1000)
+
+    def tick(self):
+        self.after_id = None
+        left = self.remaining()
+        shown = math.ceil(left)
+        self.on_tick(shown)
+        if shown == 0:
+            self.on_timeout()
+            return
+        # Wake up just after the shown number of seconds next changes
+        self.after_id = self.root.after(math.ceil((left - (shown - 1)) * 1000), self.tick)
+
+# ================== RESULTS STORE ==================
+# Finished quizzes go to this app's own copy of the ex1.py results database
+RESULTS_FILE = os.path.join(APP_DIR, "quiz_results.db")
+
 class MathQuizApp:
     def __init__(self, root):
         self.root = root
@@ -18,15 +156,15 @@ class MathQuizApp:
         self.root.geometry(f"{self.win_width}x{self.win_height}")
         self.root.resizable(False, False)
         
-        # Game State
-        self.score = 0
-        self.question_count = 0
-        self.difficulty = 0
-        self.current_attempt = 1
-        self.correct_answer = 0
-        self.total_questions = 10
-        self.time_left = 15
-        self.timer_id = None
+        # Game State (rules and scoring live in the engine)
+        self.quiz = QuizEngine(total_questions=10)
+        self.time_limit = 15   # seconds per attempt
+        self.player = default_player()
+        try:
+            self.store = ResultsStore(RESULTS_FILE)
+        except sqlite3.Error as e:
+            print(f"Results Error: {e}")
+            self.store = None
 
         # --- CANVAS SETUP ---
         self.canvas = tk.Canvas(root, width=self.win_width, height=self.win_height, highlightthickness=0)
@@ -43,6 +181,10 @@ class MathQuizApp:
         self.hud_font = ("Arial", 18, "bold")
         self.timer_font = ("Arial", 22, "bold")
 
+        # Screens are built once and then shown/hidden (Dark Blue buttons, MediumBlue hover)
+        self.ui = CanvasUI(self.canvas, self.btn_font, hover_color="#0000CD")
+        self.clock = QuestionClock(self.root, self.show_time_left, self.handle_timeout)
+
         # Start
         self.displayWelcome()
 
@@ -58,61 +200,29 @@ class MathQuizApp:
             print(f"Background Error: {e}")
             self.canvas.config(bg="#f0f0f0") 
 
-    def clear_ui(self):
-        """Clears UI elements."""
-        self.canvas.delete("ui_element")
-        self.canvas.delete("btn_shape")
-        self.canvas.delete("btn_text")
+    def show_screen(self, name, build):
+        """Stops the question timer and switches the canvas to another screen."""
         self.stop_timer()
-
-    # ================== CUSTOM OVAL BUTTON (DARK BLUE) ==================
-    def create_oval_button(self, x, y, text, command, width=200, height=50, bg_color="#00008B"):
-        # Dark Blue Colors
-        btn_color = bg_color  # DarkBlue default
-        hover_color = "#0000CD" # MediumBlue (Lighter for hover)
-        text_color = "white"
-
-        btn_tag_shape = f"btn_shape_{text}_{random.randint(1,10000)}"
-        btn_tag_text = f"btn_text_{text}_{random.randint(1,10000)}"
-
-        x1 = x - width // 2
-        x2 = x + width // 2
-        
-        # Draw Shape & Text
-        self.canvas.create_line(x1, y, x2, y, fill=btn_color, width=height, capstyle=tk.ROUND, tags=("ui_element", btn_tag_shape))
-        self.canvas.create_text(x, y, text=text, fill=text_color, font=self.btn_font, tags=("ui_element", btn_tag_text))
-
-        # Animation Bindings
-        def on_enter(e):
-            self.canvas.itemconfig(btn_tag_shape, fill=hover_color)
-            self.canvas.config(cursor="hand2")
-        def on_leave(e):
-            self.canvas.itemconfig(btn_tag_shape, fill=btn_color)
-            self.canvas.config(cursor="")
-        def on_click(e):
-            command()
-
-        for tag in [btn_tag_shape, btn_tag_text]:
-            self.canvas.tag_bind(tag, "<Enter>", on_enter)
-            self.canvas.tag_bind(tag, "<Leave>", on_leave)
-            self.canvas.tag_bind(tag, "<Button-1>", on_click)
+        self.ui.show(name, build)
 
     # ================== PAGE 1: WELCOME PAGE ==================
     def displayWelcome(self):
-        self.clear_ui()
-        
-        self.canvas.create_text(self.center_x, 180, text="MATH QUIZ", font=("Arial", 60, "bold"), fill="black", tags="ui_element")
-        self.canvas.create_text(self.center_x, 260, text="CHALLENGE", font=("Arial", 60, "bold"), fill="darkblue", tags="ui_element")
+        self.show_screen("welcome", self.build_welcome)
+
+    def build_welcome(self):
+        self.ui.label("welcome", "welcome_title", self.center_x, 180, text="MATH QUIZ", font=("Arial", 60, "bold"), fill="black")
+        self.ui.label("welcome", "welcome_subtitle", self.center_x, 260, text="CHALLENGE", font=("Arial", 60, "bold"), fill="darkblue")
         
         # Centered Start Button
-        self.create_oval_button(self.center_x, 420, "LET'S START", self.displayRules, width=250, height=60)
+        self.ui.button("welcome", "start", self.center_x, 420, "LET'S START", self.displayRules, width=250, height=60)
 
     # ================== PAGE 2: RULES PAGE (NO FRAME) ==================
     def displayRules(self):
-        self.clear_ui()
-        
+        self.show_screen("rules", self.build_rules)
+
+    def build_rules(self):
         # Title
-        self.canvas.create_text(self.center_x, 130, text="GAME RULES", font=self.header_font, fill="darkred", tags="ui_element")
+        self.ui.label("rules", "rules_title", self.center_x, 130, text="GAME RULES", font=self.header_font, fill="darkred")
 
         rules_text = (
             "1. You have 10 Questions to solve.\n\n"
@@ -126,184 +236,175 @@ class MathQuizApp:
         
         # Text shadow effect create karne ke liye pehle White text thora offset par banayenge
         # taake agar background dark ho ya light, text pop kare.
-        self.canvas.create_text(self.center_x + 2, 300 + 2, text=rules_text, font=self.rules_font, fill="white", justify="center", tags="ui_element") # Shadow
-        self.canvas.create_text(self.center_x, 300, text=rules_text, font=self.rules_font, fill="black", justify="center", tags="ui_element") # Main Text
+        self.ui.label("rules", "rules_shadow", self.center_x + 2, 300 + 2, text=rules_text, font=self.rules_font, fill="white", justify="center") # Shadow
+        self.ui.label("rules", "rules_text", self.center_x, 300, text=rules_text, font=self.rules_font, fill="black", justify="center") # Main Text
         
         # Next Button
-        self.create_oval_button(self.center_x, 480, "NEXT >", self.displayDifficulty, width=220, height=55)
+        self.ui.button("rules", "rules_next", self.center_x, 480, "NEXT >", self.displayDifficulty, width=220, height=55)
 
     # ================== PAGE 3: DIFFICULTY PAGE ==================
     def displayDifficulty(self):
-        self.clear_ui()
-        
-        self.canvas.create_text(self.center_x, 130, text="Select Difficulty Level", font=self.header_font, fill="black", tags="ui_element")
+        self.show_screen("difficulty", self.build_difficulty)
+
+    def build_difficulty(self):
+        self.ui.label("difficulty", "difficulty_title", self.center_x, 130, text="Select Difficulty Level", font=self.header_font, fill="black")
         
         # Buttons vertically stacked in center
-        self.create_oval_button(self.center_x, 220, "1. Easy (1 Digit)", lambda: self.start_quiz(1), width=280, height=45)
-        self.create_oval_button(self.center_x, 300, "2. Moderate (2 Digits)", lambda: self.start_quiz(2), width=280, height=45)
-        self.create_oval_button(self.center_x, 380, "3. Advanced (4 Digits)", lambda: self.start_quiz(3), width=280, height=45)
+        self.ui.button("difficulty", "easy", self.center_x, 200, "1. Easy (1 Digit)", lambda: self.start_quiz(1), width=280, height=45)
+        self.ui.button("difficulty", "moderate", self.center_x, 265, "2. Moderate (2 Digits)", lambda: self.start_quiz(2), width=280, height=45)
+        self.ui.button("difficulty", "advanced", self.center_x, 330, "3. Advanced (4 Digits)", lambda: self.start_quiz(3), width=280, height=45)
+
+        # Optional quiz code: replays the quiz it came from at the same level
+        self.ui.label("difficulty", "code_label", self.center_x - 110, 390, text="Quiz code:", font=self.btn_font, fill="black")
+        self.code_entry = tk.Entry(self.root, font=("Arial", 14), justify='center', bd=3, width=20)
+        self.ui.entry("difficulty", "code", self.center_x + 60, 390, self.code_entry)
+        self.ui.label("difficulty", "code_error", self.center_x, 428, text="", font=("Arial", 12, "bold"), fill="red")
         
         # Back Button
-        self.create_oval_button(self.center_x, 480, "< BACK", self.displayRules, width=180, height=50)
+        self.ui.button("difficulty", "difficulty_back", self.center_x, 480, "< BACK", self.displayRules, width=180, height=50)
 
     # ================== GAME LOGIC ==================
     def start_quiz(self, level):
-        self.difficulty = level
-        self.score = 0
-        self.question_count = 0
+        code = self.code_entry.get().strip()
+        if code and not (code.isdigit() and int(code) < 2 ** 63):
+            self.ui.set("code_error", text="A quiz code is the number shown on the results page")
+            return
+        self.code_entry.delete(0, tk.END)
+        self.ui.set("code_error", text="")
+        self.quiz.start(level, int(code) if code else None)
         self.next_question_setup()
 
     def next_question_setup(self):
-        if self.question_count < self.total_questions:
-            self.question_count += 1
-            self.current_attempt = 1
+        if self.quiz.next_question():
             self.displayProblem()
         else:
             self.displayResults()
 
-    def randomInt(self):
-        if self.difficulty == 1: return random.randint(0, 9)
-        elif self.difficulty == 2: return random.randint(10, 99)
-        elif self.difficulty == 3: return random.randint(1000, 9999)
-        return 0
-
-    def decideOperation(self):
-        return random.choice(['+', '-'])
-
     # --- TIMER ---
     def start_timer(self):
-        self.stop_timer()
-        self.time_left = 15
-        self.update_timer()
+        self.clock.start(self.time_limit)
 
     def stop_timer(self):
-        if self.timer_id:
-            self.root.after_cancel(self.timer_id)
-            self.timer_id = None
+        self.clock.stop()
 
-    def update_timer(self):
-        try:
-            self.canvas.itemconfig(self.timer_text_id, text=f"Time: {self.time_left}s")
-            # Warning Color Red
-            if self.time_left <= 5:
-                self.canvas.itemconfig(self.timer_text_id, fill="red")
-            else:
-                self.canvas.itemconfig(self.timer_text_id, fill="blue")
-        except: pass
-
-        if self.time_left > 0:
-            self.time_left -= 1
-            self.timer_id = self.root.after(1000, self.update_timer)
-        else:
-            self.handle_timeout()
+    def show_time_left(self, seconds):
+        # Warning Color Red
+        self.ui.set("timer", text=f"Time: {seconds}s", fill="red" if seconds <= 5 else "blue")
 
     def handle_timeout(self):
         self.stop_timer()
-        if self.current_attempt == 1:
-            self.current_attempt = 2
-            self.canvas.itemconfig(self.feedback_text_id, text="Time's Up! Last Chance!", fill="red")
+        outcome, _ = self.quiz.timeout(self.clock.elapsed_ms())
+        if outcome == QuizEngine.RETRY:
+            self.ui.set("feedback", text="Time's Up! Last Chance!", fill="red")
             self.start_timer()
         else:
-            messagebox.showinfo("Time Out", f"Time is up! The correct answer was {self.correct_answer}")
+            messagebox.showinfo("Time Out", f"Time is up! The correct answer was {self.quiz.correct_answer}")
             self.next_question_setup()
 
     # ================== PAGE 4: QUIZ PAGE (FIXED PADDING) ==================
     def displayProblem(self):
-        self.clear_ui()
-        
-        num1 = self.randomInt()
-        num2 = self.randomInt()
-        operation = self.decideOperation()
-        
-        if operation == '+': self.correct_answer = num1 + num2
-        else: self.correct_answer = num1 - num2
-            
+        self.show_screen("quiz", self.build_problem)
+        quiz = self.quiz
+
+        # Only the text that changes between questions is sent to the canvas
+        self.ui.set("hud_question", text=f"Q: {quiz.question_count}/{quiz.total_questions}")
+        self.ui.set("hud_score", text=f"Score: {quiz.score}")
+        self.ui.set("problem", text=f"{quiz.num1} {quiz.operation} {quiz.num2} =")
+        self.ui.set("feedback", text="", fill="black")
+        self.answer_entry.delete(0, tk.END)
+        self.answer_entry.focus()
+
+        self.start_timer()
+
+    def build_problem(self):
         # --- HUD (Padding Increase) ---
         # Moved X,Y from 30,30 to 50,60 for better spacing
-        self.canvas.create_text(50, 60, text=f"Q: {self.question_count}/{self.total_questions}", 
-                                font=self.hud_font, fill="black", anchor="nw", tags="ui_element")
-        
-        self.canvas.create_text(self.win_width - 50, 60, text=f"Score: {self.score}", 
-                                font=self.hud_font, fill="darkgreen", anchor="ne", tags="ui_element")
+        self.ui.label("quiz", "hud_question", 50, 60, text="", font=self.hud_font, fill="black", anchor="nw")
+        self.ui.label("quiz", "hud_score", self.win_width - 50, 60, text="", font=self.hud_font, fill="darkgreen", anchor="ne")
         
         # --- TIMER (Lowered Position) ---
         # Moved Y from 60 to 120 (Clear of top clip art)
-        self.timer_text_id = self.canvas.create_text(self.center_x, 120, text="Time: 15s", 
-                                                     font=self.timer_font, fill="blue", tags="ui_element")
+        self.ui.label("quiz", "timer", self.center_x, 120, text="Time: 15s", font=self.timer_font, fill="blue")
         
         # --- PROBLEM (Centered) ---
-        problem_text = f"{num1} {operation} {num2} ="
-        self.canvas.create_text(self.center_x, 240, text=problem_text, font=self.problem_font, fill="black", tags="ui_element")
+        self.ui.label("quiz", "problem", self.center_x, 240, text="", font=self.problem_font, fill="black")
         
         # --- INPUT FIELD ---
         self.answer_entry = tk.Entry(self.root, font=("Arial", 28, "bold"), justify='center', bd=4, width=8)
-        self.canvas.create_window(self.center_x, 340, window=self.answer_entry, tags="ui_element")
-        self.answer_entry.focus()
         self.answer_entry.bind('<Return>', lambda event: self.check_answer_trigger())
+        self.ui.entry("quiz", "answer", self.center_x, 340, self.answer_entry)
         
         # --- SUBMIT BUTTON ---
-        self.create_oval_button(self.center_x, 430, "SUBMIT", self.check_answer_trigger, width=200, height=55)
+        self.ui.button("quiz", "submit", self.center_x, 430, "SUBMIT", self.check_answer_trigger, width=200, height=55)
         
         # --- FEEDBACK TEXT (Bottom) ---
-        self.feedback_text_id = self.canvas.create_text(self.center_x, 500, text="", font=("Arial", 18, "bold"), fill="black", tags="ui_element")
-
-        self.start_timer()
+        self.ui.label("quiz", "feedback", self.center_x, 500, text="", font=("Arial", 18, "bold"), fill="black")
 
     def check_answer_trigger(self):
+        if not self.quiz.question_open: return   # already answered, waiting for the next question
+        if self.clock.expired():
+            # The deadline passed while the event loop was busy: it is a timeout, not an answer
+            self.handle_timeout()
+            return
         try:
             val = self.answer_entry.get()
             if not val: return 
             user_val = int(val)
-            self.isCorrect(user_val)
+            self.check_answer(user_val)
         except ValueError:
-            self.canvas.itemconfig(self.feedback_text_id, text="Please enter numbers only!", fill="red")
+            self.ui.set("feedback", text="Please enter numbers only!", fill="red")
             self.answer_entry.delete(0, tk.END)
 
-    def isCorrect(self, user_answer):
-        if user_answer == self.correct_answer:
+    def check_answer(self, user_answer):
+        outcome, points = self.quiz.isCorrect(user_answer, self.clock.elapsed_ms())
+        if outcome == QuizEngine.CORRECT:
             self.stop_timer()
-            
-            # --- POINTS LOGIC & FEEDBACK ---
-            if self.current_attempt == 1:
-                points = 10
-                msg = "Correct! +10 Points!"
-            else:
-                points = 5
-                msg = "Correct! +5 Points!"
-            
-            self.score += points
-            
-            self.canvas.itemconfig(self.feedback_text_id, text=msg, fill="green")
-            self.root.update()
+            self.ui.set("feedback", text=f"Correct! +{points} Points!", fill="green")
             self.root.after(1000, self.next_question_setup)
+        elif outcome == QuizEngine.RETRY:
+            self.ui.set("feedback", text="Wrong! Try Again (+5 pts possible)", fill="red")
+            self.answer_entry.delete(0, tk.END)
+            self.start_timer()
         else:
-            if self.current_attempt == 1:
-                self.current_attempt = 2
-                self.canvas.itemconfig(self.feedback_text_id, text="Wrong! Try Again (+5 pts possible)", fill="red")
-                self.answer_entry.delete(0, tk.END)
-                self.start_timer()
-            else:
-                self.stop_timer()
-                messagebox.showinfo("Result", f"Wrong again. Answer: {self.correct_answer}")
-                self.next_question_setup()
+            self.stop_timer()
+            messagebox.showinfo("Result", f"Wrong again. Answer: {self.quiz.correct_answer}")
+            self.next_question_setup()
 
     # ================== PAGE 5: RESULT PAGE ==================
     def displayResults(self):
-        self.clear_ui()
-        
-        grade = "F"
-        if self.score > 90: grade = "A+"
-        elif self.score > 80: grade = "A"
-        elif self.score > 70: grade = "B"
-        elif self.score > 60: grade = "C"
+        self.show_screen("results", self.build_results)
         
-        self.canvas.create_text(self.center_x, 150, text="QUIZ COMPLETED", font=("Arial", 36, "bold"), fill="black", tags="ui_element")
-        self.canvas.create_text(self.center_x, 240, text=f"Final Score: {self.score} / 100", font=("Arial", 28, "bold"), fill="darkblue", tags="ui_element")
-        self.canvas.create_text(self.center_x, 320, text=f"Rank: {grade}", font=("Arial", 48, "bold"), fill="purple", tags="ui_element")
+        self.ui.set("final_score", text=f"Final Score: {self.quiz.score} / 100")
+        self.ui.set("rank", text=f"Rank: {self.quiz.grade()}")
+        average = self.quiz.average_latency()
+        speed = f"Average answer time: {average / 1000:.2f}s   " if average is not None else ""
+        self.ui.set("quiz_code", text=f"{speed}Quiz code: {self.quiz.seed} (level {self.quiz.difficulty})")
+        self.ui.set("history", text=self.record_result())
+
+    def record_result(self):
+        """Saves the finished quiz; returns the player's record and the top score at this level."""
+        if self.store is None:
+            return ""
+        try:
+            self.store.record(self.player, self.quiz)
+            stats = self.store.player_stats(self.player, self.quiz.difficulty)
+            (leader, top, _), = self.store.leaderboard(self.quiz.difficulty, 1)
+        except sqlite3.Error as e:
+            print(f"Results Error: {e}")
+            return ""
+        return (f"{self.player}: best {stats['best']}, average {stats['average']:.0f} over {stats['sessions']} quizzes, "
+                f"{stats['first_try']:.0%} right first time   |   Top score: {top} ({leader})")
+
+    def build_results(self):
+        self.ui.label("results", "results_title", self.center_x, 150, text="QUIZ COMPLETED", font=("Arial", 36, "bold"), fill="black")
+        self.ui.label("results", "final_score", self.center_x, 240, text="", font=("Arial", 28, "bold"), fill="darkblue")
+        self.ui.label("results", "rank", self.center_x, 320, text="", font=("Arial", 48, "bold"), fill="purple")
+        self.ui.label("results", "quiz_code", self.center_x, 375, text="", font=("Arial", 12), fill="black")
+        self.ui.label("results", "history", self.center_x, 400, text="", font=("Arial", 12), fill="black")
         
         # --- NEW BUTTONS (PLAY AGAIN & EXIT) ---
-        self.create_oval_button(self.center_x - 150, 450, "PLAY AGAIN", self.displayWelcome, width=220, height=60, bg_color="green")
-        self.create_oval_button(self.center_x + 150, 450, "EXIT", self.root.destroy, width=220, height=60, bg_color="red")
+        self.ui.button("results", "play_again", self.center_x - 150, 450, "PLAY AGAIN", self.displayWelcome, width=220, height=60, bg_color="green")
+        self.ui.button("results", "exit", self.center_x + 150, 450, "EXIT", self.root.destroy, width=220, height=60, bg_color="red")
 
 if __name__ == "__main__":
     try:
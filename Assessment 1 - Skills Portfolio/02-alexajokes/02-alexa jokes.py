@@ -2,8 +2,206 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import pyttsx3  # Extended Learning: Library for voice output
 from PIL import Image, ImageTk 
+try:
+    import winsound   # Windows only: plays pre-rendered speech
+except ImportError:
+    winsound = None
+
+# Shared retained-mode widgets live one folder up, next to the app folders; the compiled
+# joke corpus is the one in ex2_corpus.py at the top of the repository
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(APP_DIR))
+sys.path.insert(1, os.path.dirname(os.path.dirname(APP_DIR)))
+from canvas_ui import CanvasUI
+from ex2_corpus import JokeCorpus
+
+class Animator:
+    """
+    One shared frame clock for all canvas text animations.
+    Ticks at a fixed rate while anything is animating and works out from a monotonic
+    clock how much of each text should be showing, so a late frame catches up instead
+    of slowing the effect down. Each frame only touches items whose visible slice
+    changed, and Tk redraws them together when the frame is done.
+    """
+    def __init__(self, root, ui, fps=60):
+        self.root, self.ui = root, ui
+        self.frame_ms = max(1, round(1000 / fps))
+        self.active = {}   # label key -> [text, start time, seconds per char, chars shown, on_done]
+        self.timer = None
+
+    def type_text(self, key, text, delay=50, on_done=None):
+        """Reveals `text` in label `key` one character every `delay` ms, then calls on_done()."""
+        self.active[key] = [text, time.monotonic(), delay / 1000, 0, on_done]
+        self.tick()
+
+    def cancel(self, keys=None):
+        """Stops the animations of the given labels (all animations if keys is None)."""
+        for key in list(self.active if keys is None else keys):
+            self.active.pop(key, None)
+        if not self.active and self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+
+    def tick(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+        self.timer = None
+        now = time.monotonic()
+        finished = []
+        for key, anim in self.active.items():
+            text, start, per_char, shown, _ = anim
+            n = min(len(text), int((now - start) / per_char) + 1)
+            if n != shown:
+                self.ui.set(key, text=text[:n])
+                anim[3] = n
+            if n == len(text):
+                finished.append(key)
+        for key in finished:
+            on_done = self.active.pop(key)[4]
+            if on_done:
+                on_done()
+        if self.active:
+            self.timer = self.root.after(self.frame_ms, self.tick)
+
+# Commands that play a WAV file where winsound is not available
+WAV_PLAYERS = (["afplay"], ["paplay"], ["aplay", "-q"])
+
+# Renders one line to a WAV file in a child process: argv = text, path, rate
+RENDER_SCRIPT = ("import sys, pyttsx3\n"
+                 "engine = pyttsx3.init()\n"
+                 "engine.setProperty('rate', int(sys.argv[3]))\n"
+                 "engine.save_to_file(sys.argv[1], sys.argv[2])\n"
+                 "engine.runAndWait()\n")
+
+class SpeechWorker:
+    """
+    Runs the text-to-speech engine on its own thread so speaking never freezes the window.
+    Lines are queued with say(); cancel() drops anything queued and cuts off the line
+    being spoken. prepare() renders a line to a WAV file in a separate process, alongside
+    whatever is being spoken, so say() can play it without a synthesis pause. Playback
+    uses winsound on Windows and afplay/paplay/aplay elsewhere; with none of them the
+    line is synthesised when it is said.
+    """
+    def __init__(self, rate=150):
+        self.rate = rate
+        self.jobs = queue.Queue()
+        self.generation = 0      # bumped by cancel(); older requests are stale
+        self.speaking = None     # generation of the line the engine is speaking
+        self.player = None if winsound else next((cmd for cmd in WAV_PLAYERS if shutil.which(cmd[0])), None)
+        self.playing = None      # player process of a pre-rendered line
+        self.prepared = None     # (text, render process, WAV path) of the upcoming line
+        self.folder = tempfile.mkdtemp(prefix="alexa-speech-")
+        self.thread = threading.Thread(target=self.run, args=(rate,), daemon=True)
+        self.thread.start()
+
+    def say(self, text):
+        self.jobs.put((self.generation, text))
+
+    def prepare(self, text):
+        """Starts rendering `text` in the background; replaces the line prepared before."""
+        if not (winsound or self.player):
+            return
+        path = os.path.join(self.folder, f"{time.monotonic_ns()}.wav")
+        try:
+            proc = subprocess.Popen([sys.executable, "-c", RENDER_SCRIPT, text, path, str(self.rate)],
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            return
+        old, self.prepared = self.prepared, (text, proc, path)
+        if old:
+            self.discard(old)
+
+    @staticmethod
+    def discard(prepared):
+        _, proc, path = prepared
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        try:
+            os.remove(path)
+        except OSError:
+            pass   # still playing on Windows; the folder is removed when the worker stops
+
+    def cancel(self):
+        self.generation += 1
+        if winsound:
+            winsound.PlaySound(None, 0)
+        playing = self.playing
+        if playing:
+            playing.terminate()
+
+    def close(self):
+        self.cancel()
+        self.jobs.put(None)
+        self.thread.join(timeout=1)
+
+    def run(self, rate):
+        try:
+            # The engine is created on this thread and only ever used here
+            try:
+                engine = pyttsx3.init()
+                engine.setProperty('rate', rate)
+                engine.connect('started-word', lambda name, location, length: self.interrupt(engine))
+            except Exception:
+                engine = None
+                print("Warning: Voice Engine could not be initialized.")
+
+            while True:
+                job = self.jobs.get()
+                if job is None:
+                    break
+                gen, text = job
+                if gen != self.generation:
+                    continue
+                prepared = self.prepared
+                if prepared and prepared[0] == text and self.play(prepared, gen):
+                    continue
+                if engine is not None:
+                    self.speaking = gen
+                    engine.say(text)
+                    engine.runAndWait()
+                    self.speaking = None
+        finally:
+            # Runs however the worker ends, so no render process or WAV file is left behind
+            if self.prepared:
+                self.discard(self.prepared)
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+    def play(self, prepared, gen):
+        """Plays a pre-rendered line; False if rendering failed and the line must be synthesised."""
+        _, proc, path = prepared
+        while proc.poll() is None:   # normally finished while the setup was being spoken
+            if gen != self.generation:
+                return True
+            time.sleep(0.02)
+        if proc.returncode != 0 or not os.path.exists(path):
+            return False
+        if gen != self.generation:
+            return True
+        if winsound:
+            winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC)
+            return True
+        try:
+            self.playing = subprocess.Popen(self.player + [path], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError:
+            return False
+        self.playing.wait()
+        self.playing = None
+        return True
+
+    def interrupt(self, engine):
+        """Called by the engine before each word: stops a line that has been cancelled."""
+        if self.speaking is not None and self.speaking != self.generation:
+            engine.stop()
 
 class JokeApp:
     """
@@ -25,13 +223,9 @@ class JokeApp:
         self.root.resizable(False, False)
         
         # --- Extended Feature: Voice Engine ---
-        # Initializes the text-to-speech engine for audio feedback
-        try:
-            self.engine = pyttsx3.init()
-            self.engine.setProperty('rate', 150)    # Adjusting speaking rate
-        except:
-            self.engine = None
-            print("Warning: Voice Engine could not be initialized.")
+        # Text-to-speech runs on a worker thread so the animations keep going while it talks
+        self.voice = SpeechWorker(rate=150)
+        self.root.protocol("WM_DELETE_WINDOW", self.quit_app)
 
         # --- Data Initialization ---
         self.jokes_list = []
@@ -55,6 +249,10 @@ class JokeApp:
         self.punchline_font = ("Comic Sans MS", 26, "bold italic") # Stylized font for impact
         self.btn_font = ("Arial", 14, "bold")
 
+        # Screens are built once and then shown/hidden; one animation clock for all of them
+        self.ui = CanvasUI(self.canvas, self.btn_font, hover_color="#4169E1")
+        self.animator = Animator(self.root, self.ui)
+
         # Initialize the application state
         self.show_start_screen()
 
@@ -82,93 +280,48 @@ class JokeApp:
 
     def load_jokes(self, filename):
         """
-        Reads jokes from an external text file.
-        Splits data into Setup and Punchline based on the '?' delimiter.
+        Opens the jokes file as a compiled JokeCorpus.
+        The text is only parsed when it has changed since the corpus was last compiled.
         """
         try:
             script_dir = os.path.dirname(os.path.abspath(__file__))
             file_path = os.path.join(script_dir, filename)
-            with open(file_path, "r", encoding='utf-8') as file:
-                lines = file.readlines()
-                for line in lines:
-                    if "?" in line:
-                        parts = line.strip().split("?")
-                        setup = parts[0] + "?"
-                        punchline = parts[1]
-                        self.jokes_list.append((setup, punchline))
+            self.jokes_list = JokeCorpus(file_path)
             if not self.jokes_list: raise ValueError
         except Exception:
             # Graceful error handling with a default joke
             self.jokes_list = [("Knock knock?", "Who's there? File not found!")]
 
-    def clear_ui(self):
-        """Resets the screen by removing dynamic UI elements."""
-        self.canvas.delete("ui_element")
-        self.canvas.delete("btn_shape")
-        self.canvas.delete("btn_text")
+    def show_screen(self, name, build):
+        """Stops running animations and switches the canvas to another screen."""
+        self.animator.cancel()
+        self.ui.show(name, build)
 
     # ================== EXTENDED FEATURES (Animation & Audio) ==================
     def speak(self, text):
-        """Outputs audio using the initialized TTS engine."""
-        if self.engine:
-            self.engine.say(text)
-            self.engine.runAndWait()
+        """Queues a line for the speech worker (returns immediately)."""
+        self.voice.say(text)
 
-    def typewriter_effect(self, text, x, y, font, color, delay=50, speak_after=False):
+    def quit_app(self):
+        self.voice.close()
+        self.root.destroy()
+
+    def typewriter_effect(self, key, text, delay=50, speak_after=False):
         """
-        Recursively renders text character-by-character to simulate typing.
+        Renders text character-by-character into the `key` label to simulate typing.
         Adds visual interest and engagement.
         """
-        text_id = self.canvas.create_text(x, y, text="", font=font, fill=color, width=600, justify="center", tags="ui_element")
-        
-        def update_text(current_text, index):
-            if index < len(text):
-                current_text += text[index]
-                self.canvas.itemconfig(text_id, text=current_text)
-                self.root.after(delay, update_text, current_text, index + 1)
-            elif speak_after:
-                self.root.after(100, lambda: self.speak(text))
-
-        update_text("", 0)
-
-    # ================== CUSTOM WIDGETS ==================
-    def create_custom_button(self, x, y, text, command, width=220, height=50, bg_color="#00008B"):
-        """
-        Creates a custom vector-based button on the Canvas.
-        Includes hover effects for better User Experience (UX).
-        """
-        hover_color = "#4169E1"
-        text_color = "white"
-        
-        # Tags for event binding
-        btn_tag_shape = f"btn_shape_{text}_{random.randint(1,10000)}"
-        btn_tag_text = f"btn_text_{text}_{random.randint(1,10000)}"
-        x1, x2 = x - width // 2, x + width // 2
-        
-        # Drawing pill shape
-        self.canvas.create_line(x1, y, x2, y, fill=bg_color, width=height, capstyle=tk.ROUND, tags=("ui_element", btn_tag_shape))
-        self.canvas.create_text(x, y, text=text, fill=text_color, font=self.btn_font, tags=("ui_element", btn_tag_text))
-
-        # Event Listeners for interactivity
-        def on_enter(e):
-            self.canvas.itemconfig(btn_tag_shape, fill=hover_color)
-            self.root.config(cursor="hand2")
-        def on_leave(e):
-            self.canvas.itemconfig(btn_tag_shape, fill=bg_color)
-            self.root.config(cursor="")
-        def on_click(e): command()
-
-        for tag in [btn_tag_shape, btn_tag_text]:
-            self.canvas.tag_bind(tag, "<Enter>", on_enter)
-            self.canvas.tag_bind(tag, "<Leave>", on_leave)
-            self.canvas.tag_bind(tag, "<Button-1>", on_click)
+        self.ui.set(key, text="")
+        self.animator.type_text(key, text, delay, on_done=(lambda: self.speak(text)) if speak_after else None)
 
     # ================== APP STATES ==================
     def show_start_screen(self):
         """Renders the initial landing page."""
-        self.clear_ui()
-        self.canvas.create_text(self.center_x, 250, text="Alexa Joke Assistant", font=("Arial", 40, "bold"), fill="black", tags="ui_element")
-        self.create_custom_button(self.center_x, 350, "Tell me a Joke", self.get_random_joke, width=250, height=60, bg_color="#379D27")
+        self.show_screen("start", self.build_start_screen)
+
+    def build_start_screen(self):
+        self.ui.label("start", "title", self.center_x, 250, text="Alexa Joke Assistant", font=("Arial", 40, "bold"), fill="black")
+        self.ui.button("start", "tell", self.center_x, 350, "Tell me a Joke", self.get_random_joke, width=250, height=60, bg_color="#379D27")
 
     def get_random_joke(self):
         """Randomly selects a joke tuple from the list."""
@@ -180,28 +333,38 @@ class JokeApp:
 
     def show_setup_state(self):
         """Displays the setup phase of the joke."""
-        self.clear_ui()
-        self.typewriter_effect(self.current_setup, self.center_x, 220, self.setup_font, "black", speak_after=True)
-        
-        self.create_custom_button(self.center_x, 350, "Show Punchline", self.show_punchline_state, width=220, height=55, bg_color="#00008B")
-        self.create_custom_button(self.win_width - 80, self.win_height - 40, "Quit", self.root.destroy, width=100, height=30, bg_color="#B22222")
+        self.show_screen("setup", self.build_joke_screens)
+        self.voice.cancel()
+        # The punchline is rendered in another process while the setup is typed and read out
+        self.voice.prepare(self.current_punchline)
+        self.typewriter_effect("setup", self.current_setup, speak_after=True)
 
     def show_punchline_state(self):
         """Displays the punchline phase with dynamic styling."""
-        self.clear_ui()
+        self.show_screen("punchline", self.build_joke_screens)
+        self.voice.cancel()   # interrupt the setup if it is still being read
         
         # Retain setup text
-        self.canvas.create_text(self.center_x, 200, text=self.current_setup, font=self.setup_font, fill="#333", width=600, justify="center", tags="ui_element")
+        self.ui.set("setup_shown", text=self.current_setup)
         
         # Dynamic color selection for visual appeal
         colors = ["#8B0000", "#4B0082", "#006400", "#800080", "#FF4500"]
-        punch_color = random.choice(colors)
+        self.ui.set("punchline", fill=random.choice(colors))
         
         # Animate punchline
-        self.typewriter_effect(self.current_punchline, self.center_x, 300, self.punchline_font, punch_color, speak_after=True)
-        
-        self.create_custom_button(self.center_x, 440, "Next Joke", self.get_random_joke, width=220, height=55, bg_color="#006400")
-        self.create_custom_button(self.win_width - 80, self.win_height - 40, "Quit", self.root.destroy, width=100, height=30, bg_color="#B22222")
+        self.typewriter_effect("punchline", self.current_punchline, speak_after=True)
+
+    def build_joke_screens(self):
+        """The setup and punchline screens, built together as they share the Quit button."""
+        self.ui.label("setup", "setup", self.center_x, 220, text="", font=self.setup_font, fill="black", width=600, justify="center")
+        self.ui.button("setup", "show_punchline", self.center_x, 350, "Show Punchline", self.show_punchline_state, width=220, height=55, bg_color="#00008B")
+
+        self.ui.label("punchline", "setup_shown", self.center_x, 200, text="", font=self.setup_font, fill="#333", width=600, justify="center")
+        self.ui.label("punchline", "punchline", self.center_x, 300, text="", font=self.punchline_font, width=600, justify="center")
+        self.ui.button("punchline", "next", self.center_x, 440, "Next Joke", self.get_random_joke, width=220, height=55, bg_color="#006400")
+
+        self.ui.button(("setup", "punchline"), "quit", self.win_width - 80, self.win_height - 40, "Quit", self.quit_app, width=100, height=30, bg_color="#B22222")
+        self.ui.mark_built("setup", "punchline")
 
 if __name__ == "__main__":
     try:
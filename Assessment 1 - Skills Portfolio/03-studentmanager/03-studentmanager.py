@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import os
+import queue
+import threading
+import time
 
 # --- Configuration ---
 FILENAME = "studentMarks.txt"
@@ -8,6 +11,17 @@ THEME_COLOR = "#0f172a"  # Navy Blue
 ACCENT_COLOR = "#0ea5e9" # Teal Blue
 BG_COLOR = "#f1f5f9"     # Light Background
 
+# Typed sort key for each table column (used instead of parsing the cell text)
+SORT_KEYS = {
+    "Code": lambda s: s.code,
+    "Name": lambda s: s.name.lower(),
+    "CW Total": lambda s: s.total_cw(),
+    "Exam": lambda s: s.exam,
+    "Total / 160": lambda s: s.total_score(),
+    "%": lambda s: s.percentage(),
+    "Grade": lambda s: s.get_grade_info(),
+}
+
 class Student:
     def __init__(self, code, name, cw1, cw2, cw3, exam):
         self.code = int(code)
@@ -27,6 +41,83 @@ class Student:
         elif p >= 40: return 'D'
         else: return 'F'
 
+def record_line(s):
+    return f"{s.code},{s.name},{s.cw[0]},{s.cw[1]},{s.cw[2]},{s.exam}"
+
+class SaveWorker:
+    """
+    Writes the marks file on a background thread so edits never wait on disk.
+    The Tk thread only queues per-record changes; a burst of edits is written
+    once, after no new change has arrived for `quiet` seconds.
+    """
+    STOP = object()
+
+    def __init__(self, path, students, quiet=0.5):
+        self.path = path
+        self.quiet = quiet
+        self.records = {s.code: record_line(s) for s in students}   # owned by the worker thread
+        self.changes = queue.Queue()
+        self.results = queue.Queue()   # (ok, message) for the Tk thread to pick up
+        self.thread = threading.Thread(target=self.run, name="save-worker", daemon=True)
+        self.thread.start()
+
+    def notify(self, old_code, code, line):
+        """Queues one change: `line` is None for a delete, `old_code` differs when the code was edited."""
+        self.changes.put((old_code, code, line))
+
+    def touch(self):
+        """Forces a write of the current records without any change."""
+        self.changes.put(None)
+
+    def close(self):
+        """Flushes anything still pending and stops the worker. Blocks until done."""
+        self.changes.put(self.STOP)
+        self.thread.join()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            item = self.changes.get()
+            if item is self.STOP:
+                return
+            pending = [item]
+            while True:
+                try:
+                    item = self.changes.get(timeout=self.quiet)
+                except queue.Empty:
+                    break
+                if item is self.STOP:
+                    stopping = True
+                    break
+                pending.append(item)
+            self.apply(pending)
+            self.flush(len(pending))
+
+    def apply(self, pending):
+        for item in pending:
+            if item is None:
+                continue
+            old_code, code, line = item
+            if line is None:
+                self.records.pop(old_code, None)
+            elif old_code != code and old_code in self.records:
+                self.records = {(code if c == old_code else c): (line if c == old_code else l)
+                                for c, l in self.records.items()}
+            else:
+                self.records[code] = line
+
+    def flush(self, edits):
+        tmp = f"{self.path}.tmp"
+        try:
+            with open(tmp, 'w') as f:
+                f.write(f"{len(self.records)}\n")
+                for line in self.records.values():
+                    f.write(line + "\n")
+            os.replace(tmp, self.path)
+            self.results.put((True, f"Saved {edits} change(s) • {time.strftime('%H:%M:%S')}"))
+        except OSError as e:
+            self.results.put((False, f"Save failed: {e}"))
+
 class StudentManagerApp:
     def __init__(self, root):
         self.root = root
@@ -35,6 +126,10 @@ class StudentManagerApp:
         self.root.configure(bg=BG_COLOR)
         
         self.students = []
+        self.shown, self.shown_iids = [], []   # rows currently in the table, in insert order
+        self.key_cache, self.sort_cache = {}, {}
+        self.sort_spec = []                    # [(column, reverse), ...] primary key first
+        self.add_sort_key = False
         self.load_data()
         
         # UI Components
@@ -44,6 +139,10 @@ class StudentManagerApp:
         self.create_main_area()
         self.refresh_table()
 
+        self.saver = SaveWorker(self.get_file_path(), self.students)
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poll_saves()
+
     def setup_styles(self):
         style = ttk.Style()
         style.theme_use('clam')
@@ -70,14 +169,32 @@ class StudentManagerApp:
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load: {e}")
 
-    def save_data(self):
+    def save_data(self, student, old_code=None, deleted=False):
+        """Hands one record change to the background save worker."""
+        old_code = student.code if old_code is None else old_code
+        self.saver.notify(old_code, student.code, None if deleted else record_line(student))
+
+    def poll_saves(self):
         try:
-            with open(self.get_file_path(), 'w') as f:
-                f.write(f"{len(self.students)}\n")
-                for s in self.students:
-                    f.write(f"{s.code},{s.name},{s.cw[0]},{s.cw[1]},{s.cw[2]},{s.exam}\n")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to save: {e}")
+            while True:
+                ok, msg = self.saver.results.get_nowait()
+                self.status.config(text=msg, fg="#475569" if ok else "#ef4444")
+        except queue.Empty:
+            pass
+        self.root.after(250, self.poll_saves)
+
+    def on_close(self):
+        self.status.config(text="Saving…")
+        self.saver.close()
+        last = None
+        while not self.saver.results.empty():
+            last = self.saver.results.get()
+        if last and not last[0] and not messagebox.askyesno("Save Error", f"{last[1]}\n\nClose anyway?"):
+            # Stay open with a fresh worker and retry the write straight away
+            self.saver = SaveWorker(self.get_file_path(), self.students)
+            self.saver.touch()
+            return
+        self.root.destroy()
 
     # --- GUI Layout ---
     def create_header(self):
@@ -101,6 +218,9 @@ class StudentManagerApp:
         return val_lbl
 
     def create_main_area(self):
+        self.status = tk.Label(self.root, text="Ready", anchor='w', bg=BG_COLOR, fg="#475569", font=("Segoe UI", 9))
+        self.status.pack(side='bottom', fill='x', padx=20, pady=(0, 6))
+
         main_frame = tk.Frame(self.root, bg=BG_COLOR)
         main_frame.pack(fill='both', expand=True, padx=20, pady=(0, 20))
 
@@ -143,13 +263,19 @@ class StudentManagerApp:
             self.tree.heading(col, text=col, command=lambda c=col: self.sort_tree(c, False))
             self.tree.column(col, width=80, anchor="center")
         self.tree.column("Name", width=180, anchor="w")
+        # Shift+click on a heading adds it as a secondary sort key (e.g. Grade then Name)
+        self.tree.bind("<ButtonPress-1>", lambda e: setattr(self, "add_sort_key", bool(e.state & 0x0001)), add="+")
 
     # --- Core Logic ---
     def refresh_table(self, data=None):
         for row in self.tree.get_children(): self.tree.delete(row)
         dataset = data if data is not None else self.students
-        for s in dataset:
+        self.shown = list(dataset)
+        self.shown_iids = [
             self.tree.insert("", "end", values=(s.code, s.name, s.total_cw(), s.exam, s.total_score(), f"{s.percentage():.1f}%", s.get_grade_info()))
+            for s in self.shown]
+        self.key_cache.clear()
+        self.sort_cache.clear()
         self.update_stats()
 
     def update_stats(self):
@@ -168,12 +294,35 @@ class StudentManagerApp:
         self.refresh_table([s for s in self.students if query in s.name.lower() or query in str(s.code)])
 
     def sort_tree(self, col, reverse):
-        l = [(self.tree.set(k, col), k) for k in self.tree.get_children('')]
-        try: l.sort(key=lambda t: float(t[0].replace('%', '')), reverse=reverse)
-        except: l.sort(reverse=reverse)
-        for index, (val, k) in enumerate(l): self.tree.move(k, '', index)
+        if self.add_sort_key and self.sort_spec:
+            cols = [c for c, _ in self.sort_spec]
+            if col in cols: self.sort_spec[cols.index(col)] = (col, reverse)
+            else: self.sort_spec.append((col, reverse))
+        else:
+            self.sort_spec = [(col, reverse)]
+        self.add_sort_key = False
+
+        perm = self.sort_permutation(tuple(self.sort_spec))
+        self.tree.set_children('', *(self.shown_iids[i] for i in perm))
         self.tree.heading(col, command=lambda: self.sort_tree(col, not reverse))
 
+    def column_keys(self, col):
+        """Typed sort key of every shown row for one column, computed once per refresh."""
+        keys = self.key_cache.get(col)
+        if keys is None:
+            keys = self.key_cache[col] = [SORT_KEYS[col](s) for s in self.shown]
+        return keys
+
+    def sort_permutation(self, spec):
+        """Row order for a (column, reverse) spec, built by stable sorts from the last key to the first."""
+        perm = self.sort_cache.get(spec)
+        if perm is None:
+            perm = list(range(len(self.shown)))
+            for col, reverse in reversed(spec):
+                perm.sort(key=self.column_keys(col).__getitem__, reverse=reverse)
+            self.sort_cache[spec] = perm
+        return perm
+
     def show_highest(self):
         if self.students: self.refresh_table([max(self.students, key=lambda s: s.percentage())])
 
@@ -214,8 +363,8 @@ class StudentManagerApp:
                 code = int(v_code.get())
                 if not (1000 <= code <= 9999): raise ValueError("Code must be 4 digits.")
                 
-                # Check duplicate ID only if adding new
-                if not student and any(s.code == code for s in self.students):
+                # Check duplicate ID (an updated student may keep its own code)
+                if any(s.code == code and s is not student for s in self.students):
                     raise ValueError("Student ID already exists.")
 
                 name = v_name.get().strip()
@@ -231,14 +380,17 @@ class StudentManagerApp:
 
                 # Save Data
                 if student: # Update existing
+                    old_code = student.code
                     student.code, student.name = code, name
                     student.cw, student.exam = [c1, c2, c3], ex
+                    self.save_data(student, old_code)
                     messagebox.showinfo("Success", "Record Updated!")
                 else: # Add new
-                    self.students.append(Student(code, name, c1, c2, c3, ex))
+                    new = Student(code, name, c1, c2, c3, ex)
+                    self.students.append(new)
+                    self.save_data(new)
                     messagebox.showinfo("Success", "Student Added!")
 
-                self.save_data()
                 self.refresh_table()
                 form.destroy()
 
@@ -271,7 +423,7 @@ class StudentManagerApp:
         
         if student and messagebox.askyesno("Confirm", f"Delete {student.name}?"):
             self.students.remove(student)
-            self.save_data()
+            self.save_data(student, deleted=True)
             self.refresh_table()
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Retained-mode canvas widgets shared by the portfolio apps.
+Each app folder puts this folder on sys.path and imports CanvasUI from here.
+"""
+import tkinter as tk
+
+
+class CanvasUI:
+    """
+    Retained-mode widgets drawn on a Canvas.
+    Labels, buttons and entries are created once under a fixed key and belong to one
+    or more named screens. show() switches screens by hiding and showing whole screen
+    tags, and set() only sends the options that changed since the last call. All
+    buttons share one set of event bindings; the button under the mouse is found
+    from its "btn:<key>" tag.
+    """
+    def __init__(self, canvas, font, hover_color):
+        self.canvas = canvas
+        self.font = font
+        self.hover_color = hover_color
+        self.items = {}     # key -> canvas item id
+        self.props = {}     # key -> options last sent to Tk
+        self.buttons = {}   # key -> (colour, command)
+        self.built = set()
+        self.current = None
+        self.hovered = None
+        canvas.tag_bind("button", "<Enter>", lambda e: self.hover(self.button_at_mouse()))
+        canvas.tag_bind("button", "<Leave>", lambda e: self.hover(None))
+        canvas.tag_bind("button", "<Button-1>", self.click)
+
+    def add(self, key, item, opts):
+        self.items[key] = item
+        self.props[key] = opts
+        return item
+
+    def screen_tags(self, screens, *extra):
+        if isinstance(screens, str):
+            screens = (screens,)
+        return (*(f"screen:{s}" for s in screens), *extra)
+
+    def label(self, screens, key, x, y, tags=(), **opts):
+        item = self.canvas.create_text(x, y, state="hidden", tags=self.screen_tags(screens, *tags), **opts)
+        return self.add(key, item, opts)
+
+    def button(self, screens, key, x, y, text, command, width=200, height=50, bg_color="#00008B"):
+        """A pill-shaped button; `key` names the text item and `key + '.shape'` the pill."""
+        x1, x2 = x - width // 2, x + width // 2
+        shape = self.canvas.create_line(x1, y, x2, y, fill=bg_color, width=height, capstyle=tk.ROUND, state="hidden",
+                                        tags=self.screen_tags(screens, "button", f"btn:{key}"))
+        self.add(key + ".shape", shape, {"fill": bg_color})
+        self.buttons[key] = (bg_color, command)
+        return self.label(screens, key, x, y, tags=("button", f"btn:{key}"), text=text, fill="white", font=self.font)
+
+    def entry(self, screens, key, x, y, widget):
+        item = self.canvas.create_window(x, y, window=widget, state="hidden", tags=self.screen_tags(screens))
+        return self.add(key, item, {})
+
+    def set(self, key, **opts):
+        """Updates an item, skipping the Tk call when nothing changed."""
+        old = self.props[key]
+        changed = {k: v for k, v in opts.items() if old.get(k) != v}
+        if changed:
+            self.canvas.itemconfig(self.items[key], **changed)
+            old.update(changed)
+
+    def mark_built(self, *screens):
+        """Records screens whose items were created by another screen's build(), so show() does not build them again."""
+        self.built.update(screens)
+
+    def show(self, name, build):
+        """Shows screen `name`, calling build() to create its items the first time."""
+        if name not in self.built:
+            build()
+            self.built.add(name)
+        self.hover(None)
+        if self.current is not None:
+            self.canvas.itemconfigure(f"screen:{self.current}", state="hidden")
+        self.canvas.itemconfigure(f"screen:{name}", state="normal")
+        self.current = name
+
+    # --- shared button bindings ---
+    def button_at_mouse(self):
+        for tag in self.canvas.gettags("current"):
+            if tag.startswith("btn:"):
+                return tag[4:]
+        return None
+
+    def hover(self, key):
+        if self.hovered is not None:
+            self.set(self.hovered + ".shape", fill=self.buttons[self.hovered][0])
+        if key is not None:
+            self.set(key + ".shape", fill=self.hover_color)
+        self.canvas.config(cursor="hand2" if key is not None else "")
+        self.hovered = key
+
+    def click(self, event):
+        key = self.button_at_mouse()
+        if key is not None:
+            self.buttons[key][1]()
@@ -3,21 +3,475 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
-
-class MathQuizGUI:
-
-    def __init__(self, root):
-        self.root = root
-        self.root.title("Arithmetic Quiz")
-        self.root.geometry("350x225")   
-
-        # Game variables
+import argparse
+import getpass
+import math
+import os
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+try:
+    import numpy as np   # optional: generates question batches in vectorised calls
+except ImportError:
+    np = None
+
+# Question Generator
+# Quizzes are generated in batches from an explicit seed. The random numbers come from a
+# counter-based hash (SplitMix64), so the same seed gives the same quizzes with or without
+# NumPy, and a quiz can be shared by quoting its seed.
+MASK64 = (1 << 64) - 1
+GOLDEN, MIX1, MIX2 = 0x9E3779B97F4A7C15, 0xBF58476D1CE4E5B9, 0x94D049BB133111EB
+
+def random_units(seed, rows, cols, stream, first=0):
+    """Rows first.. first+rows-1 of a grid of uniform floats in [0, 1), identical with or without NumPy."""
+    seed &= MASK64
+    if np is not None:
+        u64 = np.uint64
+        counter = (np.arange(first, first + rows, dtype=u64)[:, None] * u64(cols) + np.arange(cols, dtype=u64)) * u64(2) + u64(stream)
+        z = u64(seed) + counter * u64(GOLDEN)
+        z = (z ^ (z >> u64(30))) * u64(MIX1)
+        z = (z ^ (z >> u64(27))) * u64(MIX2)
+        z ^= z >> u64(31)
+        return (z >> u64(11)).astype(np.float64) * 2.0 ** -53
+
+    def unit(counter):
+        z = (seed + counter * GOLDEN) & MASK64
+        z = ((z ^ (z >> 30)) * MIX1) & MASK64
+        z = ((z ^ (z >> 27)) * MIX2) & MASK64
+        return ((z ^ (z >> 31)) >> 11) * 2.0 ** -53
+    return [[unit((r * cols + c) * 2 + stream) for c in range(cols)] for r in range(first, first + rows)]
+
+def question_space(low, high, non_negative):
+    """Number of distinct questions: every a + b, then every a - b (only a >= b when non_negative)."""
+    m = high - low + 1
+    return m * m + (m * (m + 1) // 2 if non_negative else m * m)
+
+def decode_questions(codes, low, high, non_negative):
+    """Question numbers -> (a, b, is_subtraction, answer); the triangular decode keeps a >= b."""
+    m = high - low + 1
+    if np is not None:
+        codes = np.asarray(codes, dtype=np.int64)
+        sub = codes >= m * m
+        d = np.where(sub, codes - m * m, codes)
+        a, b = d // m, d % m
+        if non_negative:
+            # d -> (row, col) with col <= row, row = floor((sqrt(8d + 1) - 1) / 2), corrected for rounding
+            row = ((np.sqrt(8 * d + 1) - 1) // 2).astype(np.int64)
+            row += (row + 1) * (row + 2) // 2 <= d
+            row -= row * (row + 1) // 2 > d
+            a = np.where(sub, row, a)
+            b = np.where(sub, d - row * (row + 1) // 2, b)
+        a, b = a + low, b + low
+        return a, b, sub, np.where(sub, a - b, a + b)
+
+    def one(code):
+        sub = code >= m * m
+        d = code - m * m if sub else code
+        a, b = divmod(d, m)
+        if sub and non_negative:
+            a = (math.isqrt(8 * d + 1) - 1) // 2
+            b = d - a * (a + 1) // 2
+        a, b = a + low, b + low
+        return a, b, sub, a - b if sub else a + b
+    rows = [[one(code) for code in row] for row in codes]
+    return tuple([[q[i] for q in row] for row in rows] for i in range(4))
+
+def generate_quizzes(low, high, count, questions=10, seed=0, non_negative=False, first=0):
+    """
+    Quizzes first .. first+count-1 of the sequence for `seed`, each of `questions` distinct
+    questions with operands in [low, high].
+    Returns (a, b, is_subtraction, answer), each count x questions (NumPy arrays when NumPy
+    is installed, nested lists otherwise). Questions are drawn without replacement from
+    the numbered question space with Floyd's algorithm, one vectorised step per column,
+    and then shuffled, so there is no rejection loop whatever the constraints.
+    """
+    space = question_space(low, high, non_negative)
+    if questions > space:
+        raise ValueError(f"only {space} distinct questions exist for {low}..{high}")
+    draws = random_units(seed, count, questions, 0, first)
+    keys = random_units(seed, count, questions, 1, first)
+
+    if np is not None:
+        chosen = np.empty((count, questions), dtype=np.int64)
+        for i, j in enumerate(range(space - questions, space)):
+            t = np.minimum((draws[:, i] * (j + 1)).astype(np.int64), j)
+            seen = (chosen[:, :i] == t[:, None]).any(axis=1)
+            chosen[:, i] = np.where(seen, j, t)
+        order = np.argsort(keys, axis=1, kind="stable")
+        return decode_questions(np.take_along_axis(chosen, order, axis=1), low, high, non_negative)
+
+    codes = []
+    for draw_row, key_row in zip(draws, keys):
+        chosen = []
+        for i, j in enumerate(range(space - questions, space)):
+            t = min(int(draw_row[i] * (j + 1)), j)
+            chosen.append(j if t in chosen else t)
+        codes.append([chosen[i] for i in sorted(range(questions), key=key_row.__getitem__)])
+    return decode_questions(codes, low, high, non_negative)
+
+def quiz_questions(batch, i):
+    """Quiz i of a generate_quizzes() batch as [(a, op, b, answer), ...] in plain ints."""
+    a, b, sub, answers = (column[i] for column in batch)
+    return [(int(x), '-' if s else '+', int(y), int(z)) for x, y, s, z in zip(a, b, sub, answers)]
+
+# Adaptive Difficulty
+# A running model of the player, kept per kind of question (operator and number of digits):
+# exponentially weighted averages of first-try accuracy and response time. Each answer
+# updates one cell in O(1), the whole model is a handful of numbers, and the adaptive
+# level asks whichever kind of question the player is expected to get right about
+# TARGET of the time.
+def digit_count(n):
+    return len(str(abs(n)))
+
+class AdaptiveModel:
+    OPS = ('+', '-')
+    DIGITS = (1, 2, 3, 4)
+    ALPHA = 0.1           # weight of the newest answer once a cell has a few answers
+    TARGET = 0.8          # success rate the adaptive level aims for
+    TARGET_MS = 8000      # answers slower than this count as partly failed
+    DECAY = 0.005         # drift back toward the prior per answer while a kind is not asked
+
+    def __init__(self, cells=None, last_asked=None):
+        self.cells = cells or {}              # (op, digits) -> [answers, accuracy, latency_ms or None]
+        self.last_asked = last_asked or {}    # (op, digits) -> value of `answered` after its latest answer
+        self.answered = max(self.last_asked.values(), default=0)   # the player's answers so far
+
+    @staticmethod
+    def prior(digits):
+        """Accuracy assumed before any answers: bigger numbers are harder."""
+        return 1.0 - 0.15 * (digits - 1)
+
+    def cell(self, op, digits):
+        if (op, digits) not in self.cells:
+            self.cells[(op, digits)] = [0, self.prior(digits), None]
+        return self.cells[(op, digits)]
+
+    def accuracy(self, op, digits):
+        """
+        The cell's accuracy, drifted back toward the prior for every answer since the kind
+        was last asked. A kind that fell through bad luck therefore comes back next to
+        TARGET and is sampled again instead of being skipped for good.
+        """
+        accuracy, prior = self.cell(op, digits)[1], self.prior(digits)
+        stale = self.answered - self.last_asked.get((op, digits), 0)
+        return prior + (accuracy - prior) * (1 - self.DECAY) ** stale
+
+    def update(self, op, digits, correct, latency_ms=None):
+        c = self.cell(op, digits)
+        c[1] = self.accuracy(op, digits)
+        self.answered += 1
+        self.last_asked[(op, digits)] = self.answered
+        c[0] += 1
+        alpha = max(self.ALPHA, 1 / (c[0] + 1))   # the prior counts as one answer
+        c[1] += alpha * (correct - c[1])
+        if latency_ms is not None:
+            c[2] = latency_ms if c[2] is None else c[2] + alpha * (latency_ms - c[2])
+
+    def success(self, op, digits):
+        """Expected chance of a quick first-try answer to this kind of question."""
+        latency_ms = self.cell(op, digits)[2]
+        accuracy = self.accuracy(op, digits)
+        if latency_ms is None or latency_ms <= self.TARGET_MS:
+            return accuracy
+        return accuracy * self.TARGET_MS / latency_ms
+
+    def pick(self, rng):
+        """
+        Chooses (op, digits) for the next question. The kinds of question either side of
+        TARGET are mixed so that on average the player succeeds TARGET of the time.
+        """
+        kinds = sorted(((self.success(op, d), op, d) for op in self.OPS for d in self.DIGITS),
+                       key=lambda k: (k[0], rng.random()))   # ties in random order
+        below = [k for k in kinds if k[0] < self.TARGET]
+        above = [k for k in kinds if k[0] >= self.TARGET]
+        if not below:
+            return above[0][1:]     # everything is easy: the hardest kind
+        if not above:
+            return below[-1][1:]    # everything is hard: the easiest kind
+        (low, *harder), (high, *easier) = below[-1], above[0]
+        return tuple(easier if rng.random() < (self.TARGET - low) / (high - low) else harder)
+
+# Quiz Engine (no widgets, so it can be driven by the GUI or by a simulation)
+class QuizEngine:
+    QUESTIONS = 10
+    RANGES = {1: (1, 9), 2: (10, 99), 3: (1000, 9999)}
+    ADAPTIVE = 4   # level whose questions follow the player's AdaptiveModel
+    LEVELS = (*RANGES, ADAPTIVE)
+
+    # answer outcomes
+    CORRECT, RETRY, WRONG = "correct", "retry", "wrong"
+
+    def __init__(self, non_negative=False, model=None):
+        self.non_negative = non_negative   # only ask subtractions whose answer is >= 0
+        self.model = model                 # AdaptiveModel updated by every first answer (optional)
+        self.rng = None
         self.difficulty = None
+        self.seed = None
+        self.questions = []
         self.question_count = 0
         self.score = 0
         self.first_attempt = True
+        self.question_open = False   # True until the current question is answered or given up
+        self.attempts = []           # (question, attempt, answer, latency_ms) for every answer given
+        self.num1 = self.num2 = self.op = None
         self.correct_answer = None
 
+    def start(self, level, seed=None, questions=None):
+        """
+        Starts a quiz. All its questions are generated up front from `seed` (a random one
+        if not given), so quoting the seed replays the same quiz. A simulation can pass
+        pre-generated `questions` instead. At the ADAPTIVE level each question is
+        chosen only when it is asked, so the seed drives the choices but does not
+        replay the quiz.
+        """
+        self.difficulty = level
+        self.question_count = 0
+        self.score = 0
+        self.attempts = []
+        if level == self.ADAPTIVE:
+            self.seed = random.getrandbits(63) if seed is None else seed
+            self.rng = random.Random(self.seed)
+            self.model = self.model or AdaptiveModel()
+            questions = []
+        elif questions is None:
+            self.seed = random.getrandbits(63) if seed is None else seed
+            low, high = self.RANGES[level]
+            questions = quiz_questions(generate_quizzes(low, high, 1, self.QUESTIONS, self.seed, self.non_negative), 0)
+        self.questions = questions
+
+    def nextQuestion(self):
+        """Sets up the next problem. Returns False once all the questions have been asked."""
+        if self.question_count == self.QUESTIONS:
+            return False
+
+        if self.difficulty == self.ADAPTIVE:
+            self.questions.append(self.adaptiveQuestion())
+        self.question_count += 1
+        self.first_attempt = True
+        self.question_open = True
+        self.num1, self.op, self.num2, self.correct_answer = self.questions[self.question_count - 1]
+        return True
+
+    def adaptiveQuestion(self):
+        """(a, op, b, answer) of the kind the model picks, in the same form as quiz_questions()."""
+        op, digits = self.model.pick(self.rng)
+        low, high = (1 if digits == 1 else 10 ** (digits - 1)), 10 ** digits - 1
+        a, b = self.rng.randint(low, high), self.rng.randint(low, high)
+        if op == '-' and self.non_negative and a < b:
+            a, b = b, a
+        return a, op, b, a + b if op == '+' else a - b
+
+    # Is correct
+    def isCorrect(self, user_answer, latency_ms=None):
+        """
+        Scores one attempt and returns (outcome, points):
+        CORRECT with 10 or 5 points, RETRY after a first wrong answer, WRONG after a second.
+        """
+        self.attempts.append((self.question_count, 1 if self.first_attempt else 2, user_answer, latency_ms))
+        if self.first_attempt and self.model is not None:
+            self.model.update(self.op, digit_count(max(self.num1, self.num2)), user_answer == self.correct_answer,
+                              latency_ms)
+        if user_answer == self.correct_answer:
+            points = 10 if self.first_attempt else 5
+            self.score += points
+            self.question_open = False
+            return self.CORRECT, points
+        if self.first_attempt:
+            self.first_attempt = False
+            return self.RETRY, 0
+        self.question_open = False
+        return self.WRONG, 0
+
+    @staticmethod
+    def calculateGrade(score):
+        if score >= 90:
+            return "A+"
+        elif score >= 80:
+            return "A"
+        elif score >= 70:
+            return "B"
+        elif score >= 60:
+            return "C"
+        elif score >= 50:
+            return "D"
+        else:
+            return "F"
+
+# Results Store
+# Every finished quiz is appended to an SQLite file: one sessions row plus one answers row
+# per attempt (operands, answer, response time). Leaderboards are read straight off the
+# (level, score) index, and per-player totals and daily trends live in summary tables that
+# each insert updates in the same transaction, so no query ever rescans the history.
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "quiz_results.db")
+
+RESULTS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    seed INTEGER,
+    score INTEGER NOT NULL,
+    finished REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_leaderboard ON sessions (level, score DESC, finished);
+CREATE TABLE IF NOT EXISTS answers (
+    session INTEGER NOT NULL REFERENCES sessions (id),
+    question INTEGER NOT NULL,
+    attempt INTEGER NOT NULL,
+    num1 INTEGER NOT NULL,
+    op TEXT NOT NULL,
+    num2 INTEGER NOT NULL,
+    answer INTEGER,
+    correct INTEGER NOT NULL,
+    latency_ms INTEGER,
+    PRIMARY KEY (session, question, attempt)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_stats (
+    player TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    {counters},
+    PRIMARY KEY (player, level)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS player_days (
+    player TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    day TEXT NOT NULL,
+    {counters},
+    PRIMARY KEY (player, level, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS adaptive (
+    player TEXT NOT NULL,
+    op TEXT NOT NULL,
+    digits INTEGER NOT NULL,
+    answers INTEGER NOT NULL,
+    accuracy REAL NOT NULL,
+    latency_ms REAL,
+    last_asked INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player, op, digits)
+) WITHOUT ROWID;
+"""
+# Running totals kept in player_stats and player_days, plus the best score
+RESULTS_COUNTERS = ("sessions", "score_sum", "questions", "first_try", "solved", "attempts", "latency_sum", "timed")
+
+class ResultsStore:
+    def __init__(self, path=RESULTS_FILE):
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        counters = ",\n    ".join(f"{c} INTEGER NOT NULL" for c in RESULTS_COUNTERS + ("best",))
+        self.db.executescript(RESULTS_SCHEMA.format(counters=counters))
+        if "last_asked" not in {row[1] for row in self.db.execute("PRAGMA table_info(adaptive)")}:
+            # Files written before the drift toward the prior was kept across runs
+            self.db.execute("ALTER TABLE adaptive ADD COLUMN last_asked INTEGER NOT NULL DEFAULT 0")
+
+    def close(self):
+        self.db.close()
+
+    def record(self, player, quiz, finished=None):
+        """Appends a finished quiz (a QuizEngine with its attempt log) and updates the summaries."""
+        finished = time.time() if finished is None else finished
+        day = time.strftime("%Y-%m-%d", time.localtime(finished))
+        rows = []
+        for question, attempt, answer, latency_ms in quiz.attempts:
+            a, op, b, correct_answer = quiz.questions[question - 1]
+            rows.append((question, attempt, a, op, b, answer, int(answer == correct_answer), latency_ms))
+        latencies = [r[-1] for r in rows if r[-1] is not None]
+        counts = (1, quiz.score, len(quiz.questions), sum(r[6] for r in rows if r[1] == 1),
+                  sum(r[6] for r in rows), len(rows), sum(latencies), len(latencies))
+
+        with self.db:
+            session = self.db.execute("INSERT INTO sessions (player, level, seed, score, finished) VALUES (?, ?, ?, ?, ?)",
+                                      (player, quiz.difficulty, quiz.seed, quiz.score, finished)).lastrowid
+            self.db.executemany("INSERT INTO answers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                [(session, *r) for r in rows])
+            add = ", ".join(f"{c} = {c} + excluded.{c}" for c in RESULTS_COUNTERS)
+            for table, key in (("player_stats", ("player", "level")), ("player_days", ("player", "level", "day"))):
+                names = key + RESULTS_COUNTERS + ("best",)
+                self.db.execute(f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))}) "
+                                f"ON CONFLICT ({', '.join(key)}) DO UPDATE SET {add}, best = max(best, excluded.best)",
+                                (player, quiz.difficulty, day)[:len(key)] + counts + (quiz.score,))
+        return session
+
+    def leaderboard(self, level, n=10):
+        """Top `n` (player, score, finished) at a level; ties go to whoever got there first."""
+        return self.db.execute("SELECT player, score, finished FROM sessions WHERE level = ? "
+                               "ORDER BY score DESC, finished LIMIT ?", (level, n)).fetchall()
+
+    @staticmethod
+    def summary(row):
+        sessions, score_sum, questions, first_try, solved, attempts, latency_sum, timed, best = row
+        return {"sessions": sessions, "average": score_sum / sessions, "best": best,
+                "first_try": first_try / questions, "solved": solved / questions,
+                "latency_ms": latency_sum / timed if timed else None}
+
+    def player_stats(self, player, level):
+        """Lifetime totals for a player at a level (None if they have not played it)."""
+        row = self.db.execute(f"SELECT {', '.join(RESULTS_COUNTERS)}, best FROM player_stats "
+                              "WHERE player = ? AND level = ?", (player, level)).fetchone()
+        return self.summary(row) if row else None
+
+    def trend(self, player, level, days=14):
+        """[(day, summary), ...] for the player's most recent `days` days of play, oldest first."""
+        rows = self.db.execute(f"SELECT day, {', '.join(RESULTS_COUNTERS)}, best FROM player_days "
+                               "WHERE player = ? AND level = ? ORDER BY day DESC LIMIT ?", (player, level, days))
+        return [(day, self.summary(rest)) for day, *rest in reversed(rows.fetchall())]
+
+    def load_model(self, player):
+        """The player's saved AdaptiveModel (a fresh one for a new player)."""
+        rows = self.db.execute("SELECT op, digits, answers, accuracy, latency_ms, last_asked FROM adaptive "
+                               "WHERE player = ?", (player,)).fetchall()
+        return AdaptiveModel({(op, digits): [answers, accuracy, latency_ms]
+                              for op, digits, answers, accuracy, latency_ms, _ in rows},
+                             {(op, digits): last_asked for op, digits, *_, last_asked in rows if last_asked})
+
+    def save_model(self, player, model):
+        """Saves the cells with when each was last asked, so the drift toward the prior carries over."""
+        with self.db:
+            self.db.executemany("INSERT OR REPLACE INTO adaptive VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                [(player, *kind, *cell, model.last_asked.get(kind, 0))
+                                 for kind, cell in model.cells.items()])
+
+def default_player():
+    try:
+        return getpass.getuser()
+    except (OSError, KeyError):
+        return "player"
+
+def print_leaderboard(store, player, n=10):
+    for level in QuizEngine.LEVELS:
+        print(f"Level {level} top {n}:")
+        for rank, (name, score, finished) in enumerate(store.leaderboard(level, n), 1):
+            print(f"  {rank:>2}. {name:<16} {score:>3}  {time.strftime('%Y-%m-%d', time.localtime(finished))}")
+        stats = store.player_stats(player, level)
+        if stats:
+            speed = f", {stats['latency_ms'] / 1000:.1f}s per answer" if stats["latency_ms"] is not None else ""
+            print(f"  {player}: {stats['sessions']} quizzes, average {stats['average']:.1f}, best {stats['best']}, "
+                  f"{stats['first_try']:.0%} right first time{speed}")
+            for day, d in store.trend(player, level, 7):
+                print(f"    {day}  average {d['average']:5.1f}  first try {d['first_try']:4.0%}")
+
+class MathQuizGUI:
+
+    def __init__(self, root, seed=None, non_negative=False, player=None, store=None):
+        self.root = root
+        self.root.title("Arithmetic Quiz")
+        self.root.geometry("350x285")
+
+        # Game state lives in the engine; this class only draws it
+        self.seed = seed   # replay a shared quiz (first game only)
+        self.player = player or default_player()
+        self.store = store   # ResultsStore, or None to keep no history
+        model = None
+        if store is not None:
+            try:
+                model = store.load_model(self.player)
+            except sqlite3.Error as e:
+                print(f"Could not load the adaptive model: {e}", file=sys.stderr)
+        self.quiz = QuizEngine(non_negative, model or AdaptiveModel())
+        self.asked = None    # time.monotonic() when the current attempt was shown
+
         self.displayMenu()
 
     # Display
@@ -32,56 +486,30 @@ class MathQuizGUI:
                   command=lambda: self.startQuiz(2)).pack(pady=8)
         tk.Button(self.root, text="3. Advanced (4-digit numbers)", width=30, bg="#B85D57", fg="black",
                   command=lambda: self.startQuiz(3)).pack(pady=8)
+        tk.Button(self.root, text="4. Adaptive (follows how you do)", width=30, bg="#6F8FCF", fg="black",
+                  command=lambda: self.startQuiz(QuizEngine.ADAPTIVE)).pack(pady=8)
 
     # Start Quiz
     def startQuiz(self, level):
-        self.difficulty = level
-        self.question_count = 0
-        self.score = 0
-
+        self.quiz.start(level, self.seed)
+        self.seed = None
         self.nextQuestion()
 
-    # Random Int
-    def randomInt(self):
-        if self.difficulty == 1:
-            return random.randint(1, 9)
-        elif self.difficulty == 2:
-            return random.randint(10, 99)
-        else:
-            return random.randint(1000, 9999)
-
-    # Decide Operation
-    def decideOperation(self):
-        return random.choice(['+', '-'])
-
     # Display Operation
     def nextQuestion(self):
-        if self.question_count == 10:
+        if not self.quiz.nextQuestion():
             self.displayResults()
             return
-
-        self.question_count += 1
-        self.first_attempt = True
-
-        # Generate problem
-        self.num1 = self.randomInt()
-        self.num2 = self.randomInt()
-        self.op = self.decideOperation()
-
-        if self.op == '+':
-            self.correct_answer = self.num1 + self.num2
-        else:
-            self.correct_answer = self.num1 - self.num2
-
         self.displayProblem()
 
     def displayProblem(self):
         self.clearWindow()
+        quiz = self.quiz
 
-        q_text = f"Question {self.question_count} of 10"
+        q_text = f"Question {quiz.question_count} of {quiz.QUESTIONS}"
         tk.Label(self.root, text=q_text, font=("Arial", 14)).pack(pady=10)
 
-        problem_text = f"{self.num1} {self.op} {self.num2} ="
+        problem_text = f"{quiz.num1} {quiz.op} {quiz.num2} ="
         tk.Label(self.root, text=problem_text, font=("Arial", 20)).pack(pady=10)
 
         self.answer_entry = tk.Entry(self.root, font=("Arial", 14))
@@ -89,6 +517,7 @@ class MathQuizGUI:
         self.answer_entry.focus()
         self.answer_entry.bind("<Return>", lambda event: self.checkAnswer())
         tk.Button(self.root, text="Submit Answer", bg="#4D8FD1", fg="black", command=self.checkAnswer).pack(pady=15)
+        self.asked = time.monotonic()
 
     # Is correct
     def checkAnswer(self):
@@ -98,47 +527,48 @@ class MathQuizGUI:
             messagebox.showerror("Invalid Input", "Please enter a number.")
             return
 
-        if user_answer == self.correct_answer:
-            if self.first_attempt:
-                self.score += 10
-                messagebox.showinfo("Correct!", "Correct! +10 points")
-            else:
-                self.score += 5
-                messagebox.showinfo("Correct!", "Correct! +5 points")
+        outcome, points = self.quiz.isCorrect(user_answer, round((time.monotonic() - self.asked) * 1000))
+        if outcome == QuizEngine.CORRECT:
+            messagebox.showinfo("Correct!", f"Correct! +{points} points")
             self.nextQuestion()
+        elif outcome == QuizEngine.RETRY:
+            messagebox.showwarning("Incorrect", "Wrong answer! Try again.")
+            self.asked = time.monotonic()
         else:
-            if self.first_attempt:
-                self.first_attempt = False
-                messagebox.showwarning("Incorrect", "Wrong answer! Try again.")
-            else:
-                messagebox.showinfo("Incorrect", f"Wrong again! Correct answer was {self.correct_answer}")
-                self.nextQuestion()
+            messagebox.showinfo("Incorrect", f"Wrong again! Correct answer was {self.quiz.correct_answer}")
+            self.nextQuestion()
 
     # Display results
     def displayResults(self):
         self.clearWindow()
 
-        grade = self.calculateGrade(self.score)
+        score = self.quiz.score
+        grade = QuizEngine.calculateGrade(score)
 
-        tk.Label(self.root, text=f"Your Score: {self.score}/100", font=("Arial", 20)).pack(pady=10)
+        tk.Label(self.root, text=f"Your Score: {score}/100", font=("Arial", 20)).pack(pady=10)
         tk.Label(self.root, text=f"Grade: {grade}", font=("Arial", 18)).pack(pady=10)
+        if self.quiz.difficulty != QuizEngine.ADAPTIVE:   # adaptive quizzes cannot be replayed
+            tk.Label(self.root, text=f"Quiz code: {self.quiz.seed}", font=("Arial", 9)).pack()
+        history = self.recordResult()
+        if history:
+            tk.Label(self.root, text=history, font=("Arial", 9)).pack()
 
         tk.Button(self.root, text="Play Again", bg="#5EC462", fg="black" , command=self.displayMenu).pack(pady=10)
         tk.Button(self.root, text="Exit", bg="#B85D57", fg="black" , command=self.root.quit).pack(pady=10)
 
-    def calculateGrade(self, score):
-        if score >= 90:
-            return "A+"
-        elif score >= 80:
-            return "A"
-        elif score >= 70:
-            return "B"
-        elif score >= 60:
-            return "C"
-        elif score >= 50:
-            return "D"
-        else:
-            return "F"
+    def recordResult(self):
+        """Saves the finished quiz; returns a one-line summary of the player's history at this level."""
+        if self.store is None:
+            return None
+        try:
+            self.store.record(self.player, self.quiz)
+            self.store.save_model(self.player, self.quiz.model)
+            stats = self.store.player_stats(self.player, self.quiz.difficulty)
+        except sqlite3.Error as e:
+            print(f"Could not save results: {e}", file=sys.stderr)
+            return None
+        return (f"{self.player}: best {stats['best']}, average {stats['average']:.0f} "
+                f"over {stats['sessions']} quizzes, {stats['first_try']:.0%} first try")
 
     # Clear Window
     def clearWindow(self):
@@ -146,7 +576,119 @@ class MathQuizGUI:
             widget.destroy()
 
 
-# RUN APP
-root = tk.Tk()
-app = MathQuizGUI(root)
-root.mainloop()
+# Simulation: plays many quizzes with a simulated player, no window
+SIMULATION_BATCH = 10000   # quizzes generated per call
+
+def simulate(level, first, sessions, skill, seed, non_negative=False):
+    """
+    Plays quizzes first .. first+sessions-1 of `seed` where each attempt is right with
+    probability `skill`. Returns (score counts, grade counts, questions asked, seconds).
+    """
+    rng = random.Random(seed * 1000003 + first)
+    quiz = QuizEngine(non_negative)
+    low, high = QuizEngine.RANGES[level]
+    scores, grades = Counter(), Counter()
+    questions = 0
+    started = time.perf_counter()
+    for n in range(sessions):
+        if n % SIMULATION_BATCH == 0:
+            batch = generate_quizzes(low, high, min(SIMULATION_BATCH, sessions - n), QuizEngine.QUESTIONS, seed,
+                                     non_negative, first=first + n)
+        quiz.start(level, questions=quiz_questions(batch, n % SIMULATION_BATCH))
+        while quiz.nextQuestion():
+            questions += 1
+            while True:
+                guess = quiz.correct_answer if rng.random() < skill else quiz.correct_answer + 1
+                outcome, _ = quiz.isCorrect(guess)
+                if outcome != QuizEngine.RETRY:
+                    break
+        scores[quiz.score] += 1
+        grades[QuizEngine.calculateGrade(quiz.score)] += 1
+    return scores, grades, questions, time.perf_counter() - started
+
+def expected_scores(skill):
+    """Exact score distribution for the simulated player (10 independent questions)."""
+    per_question = {10: skill, 5: (1 - skill) * skill, 0: (1 - skill) ** 2}
+    dist = {0: 1.0}
+    for _ in range(QuizEngine.QUESTIONS):
+        nxt = Counter()
+        for total, p in dist.items():
+            for points, q in per_question.items():
+                nxt[total + points] += p * q
+        dist = nxt
+    return dist
+
+def run_simulation(sessions, level, skill, workers, seed, non_negative=False):
+    """Spreads the sessions over a process pool and checks the results against expected_scores()."""
+    workers = workers or os.cpu_count() or 1
+    chunks = [sessions // workers + (i < sessions % workers) for i in range(workers)]
+    firsts = [sum(chunks[:i]) for i in range(workers)]
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(simulate, [level] * workers, firsts, chunks, [skill] * workers, [seed] * workers,
+                                [non_negative] * workers))
+    wall = time.perf_counter() - started
+
+    scores, grades = Counter(), Counter()
+    questions, engine_time = 0, 0.0
+    for s, g, q, t in results:
+        scores.update(s)
+        grades.update(g)
+        questions += q
+        engine_time += t
+
+    # Validation: legal scores, consistent grades and the exact distribution
+    problems = [f"impossible score {s}" for s in scores if s % 5 or not 0 <= s <= 100]
+    expected_grades = Counter()
+    for s, n in scores.items():
+        expected_grades[QuizEngine.calculateGrade(s)] += n
+    if expected_grades != grades:
+        problems.append("grades do not match calculateGrade()")
+    expected = expected_scores(skill)
+    worst = max(abs(scores[s] / sessions - p) for s, p in expected.items())
+    tolerance = 5 * max(p * (1 - p) for p in expected.values()) ** 0.5 / sessions ** 0.5 + 1e-9
+    if worst > tolerance:
+        problems.append(f"score distribution is off by {worst:.4f} (allowed {tolerance:.4f})")
+
+    print(f"{sessions:,} quizzes at level {level}, skill {skill}, {workers} worker(s): {wall:.2f}s wall")
+    print(f"Per question: {engine_time / questions * 1e6:.2f} us (engine plus simulated player)")
+    mean = sum(s * n for s, n in scores.items()) / sessions
+    print(f"Mean score {mean:.2f} (expected {sum(s * p for s, p in expected.items()):.2f})")
+    for grade in ("A+", "A", "B", "C", "D", "F"):
+        print(f"  {grade:<2} {grades[grade] / sessions:7.2%}")
+    for problem in problems:
+        print("FAIL:", problem)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arithmetic Quiz")
+    parser.add_argument("--simulate", type=int, metavar="N", help="play N quizzes without a window and check the scoring")
+    parser.add_argument("--level", type=int, choices=(1, 2, 3), default=2)
+    parser.add_argument("--skill", type=float, default=0.7, help="chance a simulated answer is right")
+    parser.add_argument("--workers", type=int, default=None, help="simulation processes (default: all cores)")
+    parser.add_argument("--non-negative", action="store_true", help="no subtractions with a negative answer")
+    parser.add_argument("--seed", type=int, default=None, help="quiz code to replay (or simulation seed)")
+    parser.add_argument("--player", default=None, help="name results are saved under (default: login name)")
+    parser.add_argument("--results", default=RESULTS_FILE, help="results database")
+    parser.add_argument("--leaderboard", action="store_true", help="print the saved leaderboards and your history")
+    args = parser.parse_args()
+
+    if args.simulate:
+        sys.exit(run_simulation(args.simulate, args.level, args.skill, args.workers, args.seed or 0, args.non_negative))
+
+    try:
+        store = ResultsStore(args.results)
+    except sqlite3.Error as e:
+        print(f"Could not open results database: {e}", file=sys.stderr)
+        store = None
+    if args.leaderboard:
+        if store is None:
+            sys.exit(1)
+        print_leaderboard(store, args.player or default_player())
+        sys.exit(0)
+
+    # RUN APP
+    root = tk.Tk()
+    app = MathQuizGUI(root, seed=args.seed, non_negative=args.non_negative, player=args.player, store=store)
+    root.mainloop()
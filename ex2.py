@@ -2,49 +2,372 @@ import tkinter as tk
 from tkinter import messagebox
 import random
 import os
+import sys
+import argparse
+import http.client
+import json
+import mmap
+import queue
+import threading
+import time
+import uuid
+import re
+import struct
+from array import array
+from bisect import bisect_left
+from collections import deque
+from urllib.parse import urlencode, urlsplit
+
+from ex2_corpus import JokeCorpus
 
 # path of the joke file in the same directory
 JOKES_FILE = "randomJokes.txt"
 
-def load_jokes():
+class ShuffleBag:
+    """
+    Deals joke numbers 0..n-1 in random order with no repeats until the bag is
+    empty. It is a Fisher-Yates shuffle advanced one swap per draw, so only the
+    positions touched so far are stored. Each draw appends one number to a
+    history file, which lets a restart carry on with the same bag. When a new
+    bag starts, the last `window` jokes are held back until they are at least
+    `window` draws old. With path=None the bag lives in memory only.
+    """
+    MAGIC = b"JOKEBAG1"
+    HEADER = struct.Struct("<8sqqqq")   # magic, n, window, corpus mtime_ns, corpus size
+    ITEM = struct.Struct("<q")
+
+    def __init__(self, n, path, stamp=(0, 0), window=10):
+        self.n, self.path, self.stamp = n, path, stamp
+        self.window = min(window, n // 2)
+        self.log = None
+        if not self.resume():
+            self.new_bag([])
+
+    def start(self, held):
+        """Resets the permutation, parking the held-back jokes (oldest first) at the tail."""
+        self.swaps, self.k, self.held = {}, 0, len(held)
+        self.recent = deque(maxlen=self.window)
+        where = {}
+        for pos, item in zip(range(self.n - len(held), self.n), held):
+            p = where.get(item, item)
+            moved = self.swaps.get(pos, pos)
+            self.swaps[p], self.swaps[pos] = moved, item
+            where[moved], where[item] = p, pos
+
+    def new_bag(self, held):
+        self.start(held)
+        if self.path is None:
+            return
+        try:
+            if self.log: self.log.close()
+            self.log = open(self.path, "wb")
+            self.log.write(self.HEADER.pack(self.MAGIC, self.n, len(held), *self.stamp))
+            self.log.write(array("q", held).tobytes())
+            self.log.flush()
+        except OSError:
+            self.log = None   # history cannot be saved: shuffle in memory only
+
+    def resume(self):
+        if self.path is None:
+            return False
+        try:
+            with open(self.path, "rb") as f:
+                data = f.read()
+            magic, n, held, *stamp = self.HEADER.unpack_from(data, 0)
+        except (OSError, struct.error):
+            return False
+        if magic != self.MAGIC or n != self.n or tuple(stamp) != tuple(self.stamp):
+            return False
+        items = array("q")
+        items.frombytes(data[self.HEADER.size:len(data) - (len(data) - self.HEADER.size) % 8])
+        self.start(list(items[:held]))
+        for j in items[held:]:
+            if not self.k <= j < self.n:
+                return False
+            self.step(j)
+        try:
+            self.log = open(self.path, "ab")
+        except OSError:
+            self.log = None
+        return True
+
+    def step(self, j):
+        picked = self.swaps.get(j, j)
+        self.swaps[j] = self.swaps.get(self.k, self.k)
+        self.swaps.pop(self.k, None)   # position k is dealt and never read again
+        self.k += 1
+        self.recent.append(picked)
+        return picked
+
+    def draw(self):
+        if self.k >= self.n:
+            self.new_bag(list(self.recent))
+        # Held-back tail positions open up one per draw, oldest first
+        hi = self.n - self.held + self.k if self.k < self.held else self.n
+        j = random.randrange(self.k, hi)
+        if self.log:
+            self.log.write(self.ITEM.pack(j))
+            self.log.flush()
+        return self.step(j)
+
+# Words too common to say what a joke is about
+STOP_WORDS = frozenset("""
+a about after all am an and any are as at be because been but by can could did do does
+for from get got had has have he her him his how i if in into is it its just me my no not
+of off on or our out over so some than that the their them then there they this to too up
+us was we were what when where which who why will with would you your
+""".split())
+
+# Category tags: a joke gets '#<category>' when it contains any of the keywords
+CATEGORIES = {
+    "animal": {"animal", "bear", "bee", "bird", "cat", "chicken", "cow", "dog", "duck", "elephant",
+               "fish", "frog", "horse", "lion", "monkey", "mouse", "owl", "pig", "sheep", "snake"},
+    "food": {"apple", "banana", "bread", "cake", "cheese", "chef", "coffee", "cookie", "dinner", "eat",
+             "egg", "food", "lunch", "pizza", "potato", "restaurant", "soup", "tea"},
+    "school": {"book", "class", "homework", "math", "pencil", "school", "student", "teacher", "test"},
+    "science": {"astronaut", "atom", "chemist", "computer", "moon", "physic", "planet", "robot",
+                "science", "scientist", "space", "sun"},
+    "music": {"band", "drum", "guitar", "music", "musician", "piano", "sing", "song"},
+    "sport": {"ball", "baseball", "basketball", "football", "golf", "race", "soccer", "sport", "team", "tennis"},
+    "work": {"boss", "doctor", "farmer", "janitor", "job", "lawyer", "office", "work"},
+}
+
+def tokenize(text):
+    """Lower-cased words of `text` without stop words, with a plain plural 's' taken off."""
+    words = []
+    for w in re.findall(r"[a-z0-9]+", text.lower().replace("'", "")):
+        if w in STOP_WORDS:
+            continue
+        if len(w) > 3 and w.endswith("s") and not w.endswith("ss"):
+            w = w[:-1]
+        words.append(w)
+    return words
+
+class JokeSearch:
+    """
+    Inverted index from words and '#category' tags to joke numbers in a JokeCorpus,
+    built once and saved next to the jokes file as <file>.search (rebuilt when the
+    text file changes). The file is memory-mapped: the sorted term table is binary
+    searched and posting lists are read in place, so a lookup is a few dozen probes
+    whatever the size of the corpus.
+    """
+    MAGIC = b"JOKESRC1"   # change when tokenize() or CATEGORIES change, to force a rebuild
+    HEADER = struct.Struct("<8sqqqqq")   # magic, text mtime_ns, text size, terms, term string bytes, postings
+    TERM = struct.Struct("<IIII")        # term offset, term length, first posting, posting count
+
+    def __init__(self, corpus, path=JOKES_FILE + ".search"):
+        self.path, self.stamp = path, corpus.stamp
+        self.data = self.open_index() or self.build(corpus)
+        _, _, _, self.terms, string_bytes, _ = self.HEADER.unpack_from(self.data, 0)
+        self.strings = self.HEADER.size + self.terms * self.TERM.size
+        self.ids = memoryview(self.data)[self.strings + string_bytes:].cast("I")
+
+    def open_index(self):
+        try:
+            with open(self.path, "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mm) >= self.HEADER.size:
+            magic, mtime, size, terms, string_bytes, postings = self.HEADER.unpack_from(mm, 0)
+            if (magic == self.MAGIC and (mtime, size) == self.stamp
+                    and len(mm) == self.HEADER.size + terms * self.TERM.size + string_bytes + 4 * postings):
+                return mm
+        mm.close()
+        return None
+
+    def build(self, corpus):
+        """One pass over the corpus; joke numbers are appended in order, so every posting list is sorted."""
+        index = {}
+        for i in range(len(corpus)):
+            words = set(tokenize(" ".join(corpus[i])))
+            words.update("#" + c for c, keywords in CATEGORIES.items() if not words.isdisjoint(keywords))
+            for w in words:
+                index.setdefault(w, array("I")).append(i)
+
+        table, strings, postings = bytearray(), bytearray(), array("I")
+        for term, ids in sorted((w.encode("utf-8"), ids) for w, ids in index.items()):
+            table += self.TERM.pack(len(strings), len(term), len(postings), len(ids))
+            strings += term
+            postings.extend(ids)
+        strings += bytes(-len(strings) % 4)   # keep the posting lists 4-byte aligned
+        data = (self.HEADER.pack(self.MAGIC, *self.stamp, len(index), len(strings), len(postings))
+                + bytes(table) + bytes(strings) + postings.tobytes())
+        try:
+            with open(self.path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(self.path + ".tmp", self.path)
+        except OSError:
+            pass   # read-only folder: search the in-memory index for this run
+        return data
+
+    def postings(self, term):
+        """Sorted joke numbers indexed under `term` (a read-only view, not a copy)."""
+        key = term.encode("utf-8")
+        lo, hi = 0, self.terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at, length, first, count = self.TERM.unpack_from(self.data, self.HEADER.size + mid * self.TERM.size)
+            found = self.data[self.strings + at:self.strings + at + length]
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return self.ids[first:first + count]
+        return self.ids[0:0]
+
+    def lists(self, query):
+        """Posting lists for the words of `query`, shortest first; a category name stands for its tag."""
+        return sorted((self.postings("#" + w if w in CATEGORIES else w) for w in set(tokenize(query))), key=len)
+
+    @staticmethod
+    def contains(ids, i):
+        k = bisect_left(ids, i)
+        return k < len(ids) and ids[k] == i
+
+    def find(self, query):
+        """All joke numbers about every word of `query`, in corpus order."""
+        lists = self.lists(query)
+        if not lists:
+            return []
+        if len(lists) == 1:
+            return lists[0]
+        # Walk the shortest list and binary-search the others
+        return [i for i in lists[0] if all(self.contains(ids, i) for ids in lists[1:])]
+
+    def pick(self, query, tries=64):
+        """
+        One joke number about `query` chosen uniformly at random, or None.
+        Draws from the shortest posting list until a draw is in all the others,
+        so the full intersection of two long lists is only built as a last resort.
+        """
+        lists = self.lists(query)
+        if not lists or not lists[0]:
+            return None
+        first, rest = lists[0], lists[1:]
+        for _ in range(tries):
+            i = first[random.randrange(len(first))]
+            if all(self.contains(ids, i) for ids in rest):
+                return i
+        matches = self.find(query)
+        return random.choice(matches) if matches else None
+
+class LocalJokes:
+    """Jokes straight from the corpus on disk: shuffle-bag order and indexed search."""
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.bag = ShuffleBag(len(corpus), JOKES_FILE + ".bag", stamp=corpus.stamp)
+        self.search = JokeSearch(corpus)
+
+    def next_joke(self):
+        return self.corpus[self.bag.draw()]
+
+    def joke_about(self, topic):
+        found = self.search.pick(topic)
+        return None if found is None else self.corpus[found]
+
+class JokeClient:
+    """
+    Jokes from an ex2_server.py service. Requests reuse keep-alive connections
+    from a small pool, and a background thread keeps the next few jokes of this
+    client's shuffle bag ready, so telling a joke rarely waits on the network.
+    Same interface as LocalJokes; errors are raised as OSError.
+    """
+    def __init__(self, url, pool_size=2, prefetch=3, timeout=5):
+        parts = urlsplit(url if "//" in url else "http://" + url)
+        self.host, self.port, self.timeout = parts.hostname, parts.port or 8765, timeout
+        self.client_id = uuid.uuid4().hex
+        self.pool = queue.Queue()
+        for _ in range(pool_size):
+            self.pool.put(None)   # connections are opened on first use
+        self.ready = queue.Queue(maxsize=prefetch)
+        health = self.request("/health")   # fail fast if the service is not there or not serving
+        if not isinstance(health, dict) or not health.get("jokes"):
+            raise OSError(f"joke service at {self.host}:{self.port} is not serving jokes")
+        threading.Thread(target=self.prefetch, daemon=True).start()
+
+    def request(self, path):
+        """GET `path` on a pooled connection, reconnecting once if the server closed it."""
+        conn = self.pool.get()
+        try:
+            for attempt in (1, 2):
+                if conn is None:
+                    conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    conn.request("GET", path)
+                    response = conn.getresponse()
+                    body = json.loads(response.read())
+                    return body if response.status == 200 else None
+                except (OSError, http.client.HTTPException, ValueError):
+                    conn.close()
+                    conn = None
+                    if attempt == 2:
+                        raise OSError(f"joke service at {self.host}:{self.port} is not responding")
+        finally:
+            self.pool.put(conn)
+
+    def prefetch(self):
+        while True:
+            try:
+                joke = self.request(f"/next?client={self.client_id}")
+                if joke is None:
+                    raise OSError("no joke available")   # 404/503 from the service
+                joke = joke["setup"], joke["punchline"]
+            except (OSError, KeyError, TypeError):
+                time.sleep(1)   # unreachable or unexpected reply: keep the thread alive and try again
+                continue
+            self.ready.put(joke)   # blocks while the buffer is full
+
+    def next_joke(self):
+        # Always taken from the prefetch buffer, so jokes come out in the bag's order
+        try:
+            return self.ready.get(timeout=self.timeout)
+        except queue.Empty:
+            raise OSError(f"joke service at {self.host}:{self.port} is not responding") from None
+
+    def joke_about(self, topic):
+        joke = self.request("/search?" + urlencode({"q": topic}))
+        return None if joke is None else (joke["setup"], joke["punchline"])
+
+def open_jokes():
+    """The compiled, memory-mapped joke corpus ([] if the file is missing or unreadable)."""
     if not os.path.exists(JOKES_FILE):
         messagebox.showerror("Error", f"Could not find {JOKES_FILE}!")
         return []
-    
-    jokes = []
     try:
-        with open(JOKES_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                # '?' to separate setup and punchline
-                if "?" in line:
-                    setup, punchline = line.split("?", 1)
-                    
-                    setup = setup.strip() + "?"
-                    punchline = punchline.strip()
-                    jokes.append((setup, punchline))
+        return JokeCorpus(JOKES_FILE)
     except Exception as e:
         messagebox.showerror("Error", f"Failed to read jokes file:\n{e}")
         return []
-    
-    return jokes
 
 class JokeApp:
-    def __init__(self, root):
+    def __init__(self, root, server=None):
         self.root = root
         self.root.title("Alexa Tell Me a Joke")
-        self.root.geometry("600x400")
+        self.root.geometry("600x460")
         self.root.configure(bg="#f0f4f8")
 
-        # Load jokes
-        self.jokes = load_jokes()
+        # Jokes come from a shared joke service (client mode) or from the local corpus,
+        # which is also the fallback when the service cannot be used. The corpus is
+        # indexed so each joke is read from disk only when it is told.
+        # Either way every joke is dealt once before any repeats.
+        self.jokes = None
+        if server:
+            try:
+                self.jokes = JokeClient(server)
+            except OSError as e:
+                messagebox.showwarning("Joke Service", f"Could not use the joke service, so the local jokes file is used:\n{e}")
+        if self.jokes is None:
+            corpus = open_jokes()
+            if corpus:
+                self.jokes = LocalJokes(corpus)
         if not self.jokes:
             messagebox.showerror("No Jokes", "No jokes loaded. Exiting...")
             self.root.quit()
 
         self.current_joke = None
+        self.busy = False   # a lookup is running on a worker thread
 
         # Title Label
         title_label = tk.Label(
@@ -135,12 +458,82 @@ class JokeApp:
         )
         quit_btn.grid(row=1, column=1, pady=10)
 
+        # Search: "tell me a joke about X"
+        search_frame = tk.Frame(root, bg="#f0f4f8")
+        search_frame.pack()
+        tk.Label(search_frame, text="Joke about:", font=("Helvetica", 12), bg="#f0f4f8").pack(side=tk.LEFT)
+        self.search_entry = tk.Entry(search_frame, font=("Helvetica", 12), width=25)
+        self.search_entry.pack(side=tk.LEFT, padx=5)
+        self.search_entry.bind("<Return>", self.find_joke)
+        tk.Button(
+            search_frame,
+            text="Find",
+            font=("Helvetica", 12),
+            bg="#9b59b6",
+            fg="white",
+            command=self.find_joke
+        ).pack(side=tk.LEFT)
+
+    def fetch(self, lookup, done):
+        """
+        Runs `lookup` on a worker thread, since in client mode it waits on the network,
+        and passes its result to `done` back on the Tk thread.
+        """
+        if self.busy:
+            return
+        self.busy = True
+        result = queue.Queue(maxsize=1)
+
+        def work():
+            try:
+                result.put((lookup(), None))
+            except OSError as e:
+                result.put((None, e))
+
+        def check():
+            try:
+                joke, error = result.get_nowait()
+            except queue.Empty:
+                self.root.after(20, check)
+                return
+            self.busy = False
+            if error:
+                self.show_message(f"Alexa can't reach her jokes right now.\n{error}")
+            else:
+                done(joke)
+
+        threading.Thread(target=work, daemon=True).start()
+        self.root.after(20, check)
+
     def tell_joke(self):
         if not self.jokes:
             return
+        self.fetch(self.jokes.next_joke, self.show_joke)
+
+    def find_joke(self, event=None):
+        if not self.jokes:
+            return
+
+        # Accepts a bare topic or a whole "tell me a joke about cats"
+        topic = re.split(r"\babout\b", self.search_entry.get(), maxsplit=1, flags=re.I)[-1].strip()
+
+        def found(joke):
+            if joke is None:
+                self.show_message(f"Sorry, I don't know any jokes about {topic or 'that'}.")
+            else:
+                self.show_joke(joke)
+        self.fetch(lambda: self.jokes.joke_about(topic), found)
+
+    def show_message(self, text):
+        self.current_joke = None
+        self.setup_label.config(text=text)
+        self.punchline_label.config(text="")
+        self.show_punchline_btn.config(state=tk.DISABLED)
+        self.tell_joke_btn.config(state=tk.NORMAL)
 
-        self.current_joke = random.choice(self.jokes)
-        setup, _ = self.current_joke
+    def show_joke(self, joke):
+        self.current_joke = joke
+        setup, _ = joke
 
         self.setup_label.config(text=setup)
         self.punchline_label.config(text="")
@@ -157,6 +550,14 @@ class JokeApp:
 
 # Run the app
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Alexa Tell Me a Joke")
+    parser.add_argument("--compile", action="store_true", help="compile the joke corpus and exit")
+    parser.add_argument("--server", help="URL of an ex2_server.py joke service to use instead of the local file")
+    args = parser.parse_args()
+    if args.compile:
+        # Build step: compile the corpus ahead of time instead of on first launch
+        print(f"{len(JokeCorpus(JOKES_FILE))} jokes in {JOKES_FILE}.corpus")
+        sys.exit()
     root = tk.Tk()
-    app = JokeApp(root)
+    app = JokeApp(root, server=args.server)
     root.mainloop()
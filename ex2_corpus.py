@@ -0,0 +1,111 @@
+"""
+The compiled joke corpus shared by ex2.py, ex2_server.py and the portfolio's
+02-alexa jokes.py: the line parser and validation rules, the on-disk .corpus
+format and the memory-mapped JokeCorpus reader.
+"""
+import os
+import mmap
+import struct
+
+def parse_joke(line):
+    """
+    Splits one line of the jokes file into (setup, punchline) on the first '?',
+    so punchlines that contain a '?' of their own are kept whole.
+    Returns None for lines that are not a complete joke.
+    """
+    line = line.strip()
+    if "?" not in line:
+        return None
+    setup, punchline = (part.strip() for part in line.split("?", 1))
+    if not setup or not punchline:
+        return None   # a '?' with nothing before or after it is not a joke
+    return setup + "?", punchline
+
+def compile_corpus(path, stamp):
+    """
+    Parses, validates and deduplicates the jokes file into corpus bytes.
+    Jokes that differ only in case or spacing count as duplicates (the first one is kept),
+    and each distinct setup or punchline string is stored once.
+    """
+    blobs, blob_at = bytearray(), {}
+    entries, seen = bytearray(), set()
+
+    def intern(text):
+        if text not in blob_at:
+            raw = text.encode("utf-8")
+            blob_at[text] = (len(blobs), len(raw))
+            blobs.extend(raw)
+        return blob_at[text]
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            joke = parse_joke(line)
+            if joke is None:
+                continue
+            key = tuple(" ".join(part.split()).casefold() for part in joke)
+            if key in seen:
+                continue
+            seen.add(key)
+            entries += JokeCorpus.ENTRY.pack(*intern(joke[0]), *intern(joke[1]))
+
+    count = len(entries) // JokeCorpus.ENTRY.size
+    return JokeCorpus.HEADER.pack(JokeCorpus.MAGIC, *stamp, count, len(blobs)) + bytes(entries) + bytes(blobs)
+
+class JokeCorpus:
+    """
+    The jokes file compiled into <file>.corpus and memory-mapped: a header, a table with
+    the offset and length of each joke's setup and punchline, then the distinct strings as
+    UTF-8. Lines are parsed, validated and deduplicated once, when the corpus is compiled;
+    it is recompiled whenever the text file's mtime or size changes. Opening it does no
+    parsing, and any joke is read in constant time.
+    Behaves like a read-only sequence of (setup, punchline) tuples.
+    """
+    MAGIC = b"JOKECRP1"
+    HEADER = struct.Struct("<8sqqqq")   # magic, text mtime_ns, text size, joke count, string bytes
+    ENTRY = struct.Struct("<IIII")      # setup offset, setup length, punchline offset, punchline length
+
+    def __init__(self, path):
+        self.path = path
+        st = os.stat(path)
+        self.stamp = (st.st_mtime_ns, st.st_size)
+        self.data = self.open_corpus() or self.compile()
+        self.count = self.HEADER.unpack_from(self.data, 0)[3]
+        self.strings = self.HEADER.size + self.count * self.ENTRY.size
+
+    def open_corpus(self):
+        """Maps the compiled corpus if it still matches the jokes file, otherwise returns None."""
+        try:
+            with open(self.path + ".corpus", "rb") as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        if len(mm) >= self.HEADER.size:
+            magic, mtime, size, count, string_bytes = self.HEADER.unpack_from(mm, 0)
+            if (magic == self.MAGIC and (mtime, size) == self.stamp
+                    and len(mm) == self.HEADER.size + count * self.ENTRY.size + string_bytes):
+                return mm
+        mm.close()
+        return None
+
+    def compile(self):
+        data = compile_corpus(self.path, self.stamp)
+        try:
+            tmp = self.path + ".corpus.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.path + ".corpus")
+        except OSError:
+            pass   # read-only folder: use the compiled bytes in memory for this run
+        return data
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if not -self.count <= i < self.count:
+            raise IndexError("joke index out of range")
+        setup_at, setup_len, punch_at, punch_len = self.ENTRY.unpack_from(self.data, self.HEADER.size + (i % self.count) * self.ENTRY.size)
+        setup_at += self.strings
+        punch_at += self.strings
+        return (str(self.data[setup_at:setup_at + setup_len], "utf-8"),
+                str(self.data[punch_at:punch_at + punch_len], "utf-8"))
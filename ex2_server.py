@@ -0,0 +1,146 @@
+"""
+Local joke service for ex2.py - one process holds the corpus, any number of
+JokeApp windows (e.g. a lab of machines) fetch jokes from it over HTTP/JSON.
+
+Uses the compiled JokeCorpus and JokeSearch from ex2.py, so parsing and
+search behave exactly as in the stand-alone app.
+
+    python ex2_server.py                          # localhost:8765, randomJokes.txt
+    python ex2_server.py --host 0.0.0.0 --port 9000 --jokes lab_jokes.txt
+    python ex2.py --server http://labserver:9000  # client mode
+
+Endpoints (all GET, all JSON):
+    /health                     joke count
+    /joke                       a random joke
+    /next?client=ID             the client's next joke from its own shuffle bag (no repeats);
+                                without an id a new one is issued and returned as "client"
+    /search?q=cats              a random joke about the query (404 when there is none)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from ex2 import JOKES_FILE, JokeCorpus, JokeSearch, ShuffleBag
+
+IDLE_TIMEOUT = 30      # seconds a keep-alive connection may sit idle
+MAX_CLIENTS = 1024     # shuffle bags kept in memory; the least recently used are dropped
+
+# ====================== Joke Service ======================
+class JokeService:
+    def __init__(self, path=JOKES_FILE):
+        self.jokes = JokeCorpus(path)
+        self.search = JokeSearch(self.jokes, path + ".search")
+        self.bags = OrderedDict()   # client id -> ShuffleBag
+
+    def joke(self, i):
+        setup, punchline = self.jokes[i]
+        return {"id": i, "setup": setup, "punchline": punchline}
+
+    def bag_for(self, client):
+        bag = self.bags.pop(client, None) or ShuffleBag(len(self.jokes), None)
+        self.bags[client] = bag
+        if len(self.bags) > MAX_CLIENTS:
+            self.bags.popitem(last=False)
+        return bag
+
+    def route(self, method, target):
+        """Returns (status line, JSON body) for one request."""
+        if method != "GET":
+            return "405 Method Not Allowed", {"error": "only GET is supported"}
+        url = urlsplit(target)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return "200 OK", {"jokes": len(self.jokes)}
+        if not self.jokes:
+            return "503 Service Unavailable", {"error": "no jokes loaded"}
+        if url.path == "/joke":
+            return "200 OK", self.joke(random.randrange(len(self.jokes)))
+        if url.path == "/next":
+            client = query.get("client") or uuid.uuid4().hex   # never share one bag between anonymous callers
+            return "200 OK", {**self.joke(self.bag_for(client).draw()), "client": client}
+        if url.path == "/search":
+            found = self.search.pick(query.get("q", ""))
+            if found is None:
+                return "404 Not Found", {"error": "no jokes about that"}
+            return "200 OK", self.joke(found)
+        return "404 Not Found", {"error": f"unknown path {url.path}"}
+
+    @staticmethod
+    async def discard(reader, n):
+        while n:
+            chunk = await asyncio.wait_for(reader.read(min(n, 65536)), IDLE_TIMEOUT)
+            if not chunk:
+                raise ConnectionError("connection closed inside a request body")
+            n -= len(chunk)
+
+    async def handle(self, reader, writer):
+        """Serves one connection; HTTP/1.1 keep-alive, so a client can reuse it for many requests."""
+        try:
+            while True:
+                request = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if not request:
+                    break
+                method, target, version = request.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip().lower()
+                keep_alive = headers.get("connection", "keep-alive" if version == "HTTP/1.1" else "close") != "close"
+
+                # No route takes a body, but it must be read off the connection or the next
+                # request would start in the middle of it
+                length = headers.get("content-length", "0")
+                if "transfer-encoding" in headers or not length.isdigit():
+                    status, body, keep_alive = "400 Bad Request", {"error": "unsupported request body"}, False
+                else:
+                    await self.discard(reader, int(length))
+                    status, body = self.route(method, target)
+                data = json.dumps(body).encode("utf-8")
+                writer.write(f"HTTP/1.1 {status}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(data)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            pass   # idle, dropped or malformed connection
+        finally:
+            writer.close()
+
+# ====================== Command Line ======================
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving {len(service.jokes)} jokes on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve jokes to ex2.py clients over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="use 0.0.0.0 to serve other machines")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--jokes", default=JOKES_FILE, help="jokes text file")
+    args = parser.parse_args(argv)
+
+    try:
+        service = JokeService(args.jokes)
+    except OSError as e:
+        print(f"Could not read jokes file: {e}", file=sys.stderr)
+        return 1
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,75 +1,930 @@
 import tkinter as tk
-from tkinter import ttk, messagebox, simpledialog
+from tkinter import ttk, messagebox, simpledialog, filedialog
 import os
+import csv
+import cProfile
+import functools
+import heapq
+import queue
+import sys
+import threading
+import time
+import zlib
+from bisect import bisect_left
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+from math import ceil, floor
 
-# ====================== Student Class ======================
-class Student:
-    def __init__(self, code, name, cw1, cw2, cw3, exam):
-        self.code = int(code)
-        self.name = name.strip()
-        self.cw = [int(cw1), int(cw2), int(cw3)]
-        self.exam = int(exam)
-
-    def total_cw(self): return sum(self.cw)
-    def total_score(self): return self.total_cw() + self.exam
-    def percentage(self): return (self.total_score() / 160) * 100
-
-    def grade(self):
-        p = self.percentage()
-        if p >= 70: return 'A', '#16a34a'
-        elif p >= 60: return 'B', '#2563eb'
-        elif p >= 50: return 'C', '#7c3aed'
-        elif p >= 40: return 'D', '#d97706'
-        else: return 'F', '#dc2626'
+from ex3_records import (GRADE_COLORS, Student, FILENAME, iter_students, read_records, validate_records,
+                         export_students, record_line, file_lock, read_record_lines)
 
 # ====================== File Handling ======================
-FILENAME = "studentMarks.txt"
-
-def load_students():
-    if not os.path.exists(FILENAME):
-        messagebox.showerror("Missing File", f"{FILENAME} not found!")
+def load_students(path=FILENAME):
+    if not os.path.exists(path):
+        messagebox.showerror("Missing File", f"{path} not found!")
         return []
     try:
-        with open(FILENAME, 'r') as f:
-            lines = [line.strip() for line in f.readlines() if line.strip()]
-        students = []
-        for line in lines[1:]:
-            parts = line.split(',')
-            if len(parts) == 6:
-                code, name, c1, c2, c3, exam = parts
-                students.append(Student(code, name, c1, c2, c3, exam))
-        return students
+        return list(iter_students(path))
     except Exception as e:
         messagebox.showerror("Load Error", f"Could not read file:\n{e}")
         return []
 
-def save_students(students):
+def save_students(students, path=FILENAME):
     try:
-        with open(FILENAME, 'w') as f:
+        with open(path, 'w') as f:
             f.write(f"{len(students)}\n")
             for s in students:
                 f.write(f"{s.code},{s.name},{s.cw[0]},{s.cw[1]},{s.cw[2]},{s.exam}\n")
     except Exception as e:
         messagebox.showerror("Save Error", f"Failed to save:\n{e}")
 
+# ====================== Bulk Import / Export ======================
+def import_students(store, path):
+    """All-or-nothing import: the store is only touched when every row is valid."""
+    students, errors = validate_records(read_records(path), store.by_code)
+    if not errors:
+        for s in students:
+            store.add(s)
+    return students, errors
+
+# ====================== Rank Index & Store ======================
+MAX_SCORE = 160
+
+class RankIndex:
+    """
+    Students bucketed by total score (0-160) with a Fenwick tree over the
+    bucket counts. Ranks, top/bottom-k and score-range queries walk the
+    fixed 161 buckets instead of the roster, and stay valid through edits.
+    """
+    def __init__(self, students=()):
+        self.buckets = [{} for _ in range(MAX_SCORE + 1)]   # score -> {code: student}
+        self.fenwick = [0] * (MAX_SCORE + 2)
+        self.score_of = {}                                  # code -> score it is filed under
+        self.score_sum = 0
+        for s in students:
+            self.add(s)
+
+    def __len__(self): return len(self.score_of)
+
+    @staticmethod
+    def bucket(s): return min(max(s.total_score(), 0), MAX_SCORE)
+
+    def _bump(self, score, delta):
+        i = score + 1
+        while i < len(self.fenwick):
+            self.fenwick[i] += delta
+            i += i & -i
+
+    def count_below(self, score):
+        """Number of students with a total score strictly below `score`."""
+        i, n = min(max(score, 0), MAX_SCORE + 1), 0
+        while i > 0:
+            n += self.fenwick[i]
+            i -= i & -i
+        return n
+
+    def add(self, s):
+        score = self.bucket(s)
+        self.buckets[score][s.code] = s
+        self.score_of[s.code] = score
+        self.score_sum += score
+        self._bump(score, 1)
+
+    def remove(self, code):
+        score = self.score_of.pop(code)
+        del self.buckets[score][code]
+        self.score_sum -= score
+        self._bump(score, -1)
+
+    def update(self, s):
+        """Re-files a student whose marks were edited in place."""
+        self.remove(s.code)
+        self.add(s)
+
+    def average(self):
+        return (self.score_sum / len(self) / MAX_SCORE) * 100 if self else 0.0
+
+    def ascending(self, lo=0, hi=MAX_SCORE):
+        for score in range(max(lo, 0), min(hi, MAX_SCORE) + 1):
+            yield from self.buckets[score].values()
+
+    def descending(self, lo=0, hi=MAX_SCORE):
+        for score in range(min(hi, MAX_SCORE), max(lo, 0) - 1, -1):
+            yield from self.buckets[score].values()
+
+    def top(self, k): return list(islice(self.descending(), k))
+    def bottom(self, k): return list(islice(self.ascending(), k))
+
+    def percentile(self, s):
+        """Percentile rank: share of the class below this student, counting ties as half."""
+        score = self.score_of[s.code]
+        below = self.count_below(score)
+        ties = len(self.buckets[score])
+        return (below + ties / 2) / len(self) * 100
+
+    def between(self, lo_pct, hi_pct):
+        """Students whose percentage lies in [lo_pct, hi_pct], highest first."""
+        lo = ceil(lo_pct * MAX_SCORE / 100 - 1e-9)
+        hi = floor(hi_pct * MAX_SCORE / 100 + 1e-9)
+        return list(self.descending(lo, hi))
+
+class NameIndex:
+    """
+    Trigram index over student names. A query first finds the names that contain it,
+    checking only the names on the posting lists of the query's own trigrams; the
+    exact name ranks first, then names with a word starting with the query. Only when
+    no name contains the query are typo-tolerant matches tried: each query word is
+    compared with the words of names sharing a trigram with it. Queries of one or two
+    letters, the first keystrokes, use the name's 1- and 2-letter pieces instead,
+    and their results are cached until a name changes.
+    """
+    def __init__(self, students=()):
+        self.postings = {}   # trigram or 1-2 letter piece -> set of student codes
+        self.grams_of = {}   # code -> keys the name was indexed under
+        self.by_code = {}
+        self.short = {}      # (query, limit) -> ranked codes for queries under 3 letters
+        for s in students:
+            self.add(s)
+
+    @staticmethod
+    def trigrams(text):
+        t = f"  {' '.join(text.lower().split())} "
+        return {t[i:i + 3] for i in range(len(t) - 2)}
+
+    @classmethod
+    def keys(cls, text):
+        """Trigrams plus the 1- and 2-letter pieces of ' ' + name; ' ' + q marks a word starting with q."""
+        t = f" {' '.join(text.lower().split())}"
+        return cls.trigrams(text) | {t[i:i + n] for n in (1, 2) for i in range(len(t) - n + 1)}
+
+    def add(self, s):
+        self.short.clear()
+        grams = self.keys(s.name)
+        self.grams_of[s.code] = grams
+        self.by_code[s.code] = s
+        for g in grams:
+            self.postings.setdefault(g, set()).add(s.code)
+
+    def remove(self, code):
+        self.short.clear()
+        for g in self.grams_of.pop(code, ()):
+            codes = self.postings[g]
+            codes.discard(code)
+            if not codes:
+                del self.postings[g]
+        self.by_code.pop(code, None)
+
+    def update(self, s):
+        if self.keys(s.name) != self.grams_of.get(s.code):
+            self.remove(s.code)
+            self.add(s)
+
+    @staticmethod
+    def normal(text):
+        return ' '.join(text.lower().split())
+
+    @staticmethod
+    def similarity(a, b):
+        """1 - optimal string alignment distance / longer length, so 'jhon' vs 'john' is 0.75."""
+        if abs(len(a) - len(b)) > 2:
+            return 0.0
+        before, prev = None, list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            cur = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (a[i - 1] != b[j - 1]))
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    cur[j] = min(cur[j], before[j - 2] + 1)   # swapped letters count as one typo
+            before, prev = prev, cur
+        return 1 - prev[-1] / max(len(a), len(b))
+
+    def containing(self, q):
+        """Codes of the names that contain the normalised query `q` (of 3 letters or more)."""
+        lists = sorted((self.postings.get(q[i:i + 3], set()) for i in range(len(q) - 2)), key=len)
+        return [code for code in set.intersection(*lists) if q in self.normal(self.by_code[code].name)]
+
+    def ranked(self, q, limit):
+        """Codes of up to `limit` names containing `q`: exact name, then starts with, word starts with, contains."""
+        def rank(code):
+            name = self.normal(self.by_code[code].name)
+            tier = 0 if name == q else 1 if name.startswith(q) else 2 if f" {q}" in f" {name}" else 3
+            return tier, name, code
+        if len(q) >= 3:
+            return heapq.nsmallest(limit, self.containing(q), key=rank)
+        # Under 3 letters the pieces are exact: ' ' + q lists the names with a word starting
+        # with q (tiers 0-2), q lists every name containing it; the rest only fill up the list
+        starts = self.postings.get(" " + q, set())
+        best = heapq.nsmallest(limit, starts, key=rank)
+        if len(best) < limit:
+            rest = (code for code in self.postings.get(q, ()) if code not in starts)
+            best += heapq.nsmallest(limit - len(best), rest, key=rank)
+        return best
+
+    def search(self, query, limit=25, min_score=0.7):
+        """Names containing `query` (best first), else fuzzy matches scoring at least `min_score`."""
+        q = self.normal(query)
+        if not q:
+            return []
+        if len(q) < 3:
+            if (q, limit) not in self.short:
+                self.short[(q, limit)] = self.ranked(q, limit)
+            found = self.short[(q, limit)]
+        else:
+            found = self.ranked(q, limit)
+        if found:
+            return [self.by_code[code] for code in found]
+
+        words = q.split()
+        totals = Counter()
+        for w in words:
+            best, sim = {}, {}   # sim caches the score of each distinct name word
+            for g in self.trigrams(w):
+                for code in self.postings.get(g, ()):
+                    if code not in best:
+                        best[code] = max(sim[n] if n in sim else sim.setdefault(n, self.similarity(w, n))
+                                         for n in self.normal(self.by_code[code].name).split())
+            totals.update(best)
+        scored = [(total / len(words), code) for code, total in totals.items() if total / len(words) >= min_score]
+        return [self.by_code[code] for _, code in heapq.nlargest(limit, scored)]
+
+class ScoreBins:
+    """
+    Pre-aggregated counts for the dashboard: students per grade, per 10% band
+    and per mark of each component. Edits adjust only the bins they move
+    between, and those bins are collected in `dirty` for the next redraw.
+    """
+    COMPONENTS = (("CW1", 20), ("CW2", 20), ("CW3", 20), ("Exam", 100))
+
+    def __init__(self, students=()):
+        self.grades = dict.fromkeys("ABCDF", 0)
+        self.bands = [0] * 10                                   # 0-9%, 10-19%, ... 90-100%
+        self.marks = [[0] * (mx + 1) for _, mx in self.COMPONENTS]
+        self.filed = {}                                         # code -> (grade, band, marks)
+        self.dirty = set()
+        for s in students:
+            self.add(s)
+        self.dirty.clear()
+
+    def entry(self, s):
+        marks = tuple(min(max(m, 0), mx) for m, (_, mx) in zip((*s.cw, s.exam), self.COMPONENTS))
+        return s.grade()[0], min(int(s.percentage() // 10), 9), marks
+
+    def _move(self, old, new):
+        og, ob, om = old or (None, None, (None,) * 4)
+        ng, nb, nm = new or (None, None, (None,) * 4)
+        if og != ng:
+            if og:
+                self.grades[og] -= 1
+                self.dirty.add(('grade', og))
+            if ng:
+                self.grades[ng] += 1
+                self.dirty.add(('grade', ng))
+        if ob != nb:
+            if ob is not None:
+                self.bands[ob] -= 1
+                self.dirty.add(('band', ob))
+            if nb is not None:
+                self.bands[nb] += 1
+                self.dirty.add(('band', nb))
+        for i, (a, b) in enumerate(zip(om, nm)):
+            if a != b:
+                if a is not None: self.marks[i][a] -= 1
+                if b is not None: self.marks[i][b] += 1
+                self.dirty.add(('box', i))
+
+    def add(self, s):
+        new = self.filed[s.code] = self.entry(s)
+        self._move(None, new)
+
+    def update(self, s):
+        new = self.entry(s)
+        self._move(self.filed[s.code], new)
+        self.filed[s.code] = new
+
+    def remove(self, code):
+        self._move(self.filed.pop(code), None)
+
+    def take_dirty(self):
+        dirty, self.dirty = self.dirty, set()
+        return dirty
+
+    def box(self, i):
+        """(min, q1, median, q3, max) of component i from its mark histogram, or None if empty."""
+        counts = self.marks[i]
+        n = sum(counts)
+        if not n:
+            return None
+        targets = [0, (n - 1) * 0.25, (n - 1) * 0.5, (n - 1) * 0.75, n - 1]
+        out, seen, t = [], 0, 0
+        for mark, c in enumerate(counts):
+            seen += c
+            while t < 5 and seen > targets[t]:
+                out.append(mark)
+                t += 1
+        return tuple(out)
+
+class StudentStore:
+    """The loaded roster together with the indexes that are kept in step with it."""
+    def __init__(self, students):
+        self.students = list(students)
+        self.by_code = {s.code: s for s in self.students}
+        self.rank = RankIndex(self.students)
+        self.names = NameIndex(self.students)
+        self.bins = ScoreBins(self.students)
+        self.listeners = []   # called as listener(kind, student) with kind 'add' / 'update' / 'remove'
+
+    def __len__(self): return len(self.students)
+
+    def notify(self, kind, s):
+        for listener in self.listeners:
+            listener(kind, s)
+
+    def add(self, s):
+        self.students.append(s)
+        self.by_code[s.code] = s
+        self.rank.add(s)
+        self.names.add(s)
+        self.bins.add(s)
+        self.notify('add', s)
+
+    def update(self, s):
+        self.rank.update(s)
+        self.names.update(s)
+        self.bins.update(s)
+        self.notify('update', s)
+
+    def remove(self, s):
+        self.students.remove(s)
+        del self.by_code[s.code]
+        self.rank.remove(s.code)
+        self.names.remove(s.code)
+        self.bins.remove(s.code)
+        self.notify('remove', s)
+
+    def search(self, query):
+        """Exact student code first, otherwise ranked fuzzy name matches."""
+        query = query.strip()
+        if query.isdigit() and int(query) in self.by_code:
+            return [self.by_code[int(query)]]
+        return self.names.search(query)
+
+# ====================== Shared File Access ======================
+class MarksWatcher:
+    """
+    Notices when another process rewrites the marks file. Each record's CRC
+    is remembered, so only the lines whose checksum changed get parsed.
+    """
+    def __init__(self, path, students):
+        self.path = path
+        self.sig = self.signature()
+        self.crcs = {s.code: zlib.crc32(record_line(s).encode()) for s in students}
+
+    def signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def track(self, code, line):
+        """Records a local edit so it is not mistaken for an external one."""
+        if line is None: self.crcs.pop(code, None)
+        else: self.crcs[code] = zlib.crc32(line.encode())
+
+    def poll(self):
+        """
+        Returns (changed {code: line}, removed codes) when the file changed since the last poll, else None.
+        Never waits for the lock: while another process is writing, the read is left to the next poll.
+        """
+        sig = self.signature()
+        if sig is None or sig == self.sig:
+            return None
+        with file_lock(self.path, blocking=False) as locked:
+            if not locked:
+                return None
+            records = read_record_lines(self.path)
+        changed, crcs = {}, {}
+        for code, line in records.items():
+            crc = crcs[code] = zlib.crc32(line.encode())
+            if self.crcs.get(code) != crc:
+                changed[code] = line
+        removed = [code for code in self.crcs if code not in crcs]
+        self.crcs = crcs
+        self.sig = sig   # only once the file has been read, so a failed read is retried
+        return changed, removed
+
+# ====================== Background Saving ======================
+class SaveWorker:
+    """
+    Writes the marks file on a background thread so edits never wait on disk.
+    The Tk thread only queues per-record changes; a burst of edits is written
+    once, after no new change has arrived for `quiet` seconds. Each write
+    re-reads the file under the shared lock and applies the changes not yet
+    written, so edits saved meanwhile by other processes are kept. Changes
+    from a failed write stay queued and are applied again on every later
+    write (retried after `retry` seconds) until one succeeds.
+    """
+    STOP = object()
+
+    def __init__(self, path, students, quiet=0.5, retry=5.0, unwritten=()):
+        self.path = path
+        self.quiet = quiet
+        self.retry = retry
+        self.records = {s.code: record_line(s) for s in students}   # owned by the worker thread
+        self.unwritten = list(unwritten)   # (code, line) changes no write has stored yet, oldest first
+        self.changes = queue.Queue()
+        self.results = queue.Queue()   # (ok, message, [(code, line), ...] written or still unwritten)
+        self.thread = threading.Thread(target=self.run, name="save-worker", daemon=True)
+        self.thread.start()
+        if self.unwritten:
+            self.touch()
+
+    def notify(self, code, line):
+        """Queues one change: `line` is None for a delete."""
+        self.changes.put((code, line))
+
+    def touch(self):
+        """Forces a write of the current records without any change."""
+        self.changes.put(None)
+
+    def close(self):
+        """Flushes anything still pending and stops the worker. Blocks until done."""
+        self.changes.put(self.STOP)
+        self.thread.join()
+
+    def run(self):
+        stopping = False
+        while not stopping:
+            try:
+                item = self.changes.get(timeout=self.retry if self.unwritten else None)
+            except queue.Empty:
+                item = None   # time to retry a failed write
+            if item is self.STOP:
+                if self.unwritten:
+                    self.flush([])
+                return
+            pending = [item]
+            while True:
+                try:
+                    item = self.changes.get(timeout=self.quiet)
+                except queue.Empty:
+                    break
+                if item is self.STOP:
+                    stopping = True
+                    break
+                pending.append(item)
+            self.flush(pending)
+
+    def apply(self, changes):
+        for code, line in changes:
+            if line is None:
+                self.records.pop(code, None)
+            else:
+                self.records[code] = line
+
+    def flush(self, pending):
+        """Writes every unwritten change plus `pending`; returns how many changes were written."""
+        self.unwritten += [item for item in pending if item is not None]
+        tmp = f"{self.path}.tmp"
+        try:
+            with file_lock(self.path):
+                if os.path.exists(self.path):
+                    self.records = read_record_lines(self.path)
+                self.apply(self.unwritten)
+                with open(tmp, 'w') as f:
+                    f.write(f"{len(self.records)}\n")
+                    for line in self.records.values():
+                        f.write(line + "\n")
+                os.replace(tmp, self.path)
+        except OSError as e:
+            waiting = len({code for code, _ in self.unwritten})
+            self.results.put((False, f"Save failed: {e} • {waiting} record(s) not saved, retrying", list(self.unwritten)))
+            return 0
+        written, self.unwritten = self.unwritten, []
+        self.results.put((True, f"Saved {len(written)} change(s) • {time.strftime('%H:%M:%S')}", written))
+        return len(written)
+
+# ====================== Multi-Cohort Workspace ======================
+class Workspace:
+    """
+    A folder of cohort mark files. A cohort is parsed only when it is opened,
+    and the most recently used ones stay in a bounded LRU. A background thread
+    builds a student code -> cohort files index for cross-cohort lookups.
+    """
+    def __init__(self, folder, capacity=8):
+        self.folder = folder
+        self.capacity = capacity
+        self.files = sorted(os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith('.txt'))
+        self.cache = OrderedDict()     # path -> StudentStore, least recently used first
+        self.lock = threading.Lock()   # guards code_index between the indexer and the Tk thread
+        self.code_index = {}           # student code -> [paths]
+        self.index_ready = threading.Event()
+        threading.Thread(target=self.build_index, name="cohort-indexer", daemon=True).start()
+
+    def build_index(self):
+        for path in self.files:
+            try:
+                codes = [s.code for s in iter_students(path)]
+            except (OSError, ValueError):
+                continue   # unreadable cohort: simply not searchable
+            with self.lock:
+                for code in codes:
+                    self.code_index.setdefault(code, []).append(path)
+        self.index_ready.set()
+
+    def open(self, path):
+        """Returns the cohort's store, parsing the file only on a cache miss."""
+        store = self.cache.get(path)
+        if store is None:
+            store = self.cache[path] = StudentStore(iter_students(path))
+            while len(self.cache) > self.capacity:
+                self.cache.popitem(last=False)
+        self.cache.move_to_end(path)
+        return store
+
+    def note(self, path, kind, s):
+        """Keeps the code index right when a cohort's roster is edited."""
+        with self.lock:
+            paths = self.code_index.setdefault(s.code, [])
+            if kind == 'add' and path not in paths:
+                paths.append(path)
+            elif kind == 'remove' and path in paths:
+                paths.remove(path)
+
+    def results_for(self, code):
+        """[(path, student)] for every cohort the student appears in."""
+        with self.lock:
+            paths = list(self.code_index.get(code, ()))
+        found = []
+        for path in paths:
+            store = self.cache.get(path)
+            s = store.by_code.get(code) if store else next((x for x in iter_students(path) if x.code == code), None)
+            if s:
+                found.append((path, s))
+        return found
+
+# ====================== Treeview Row Sync ======================
+def row_values(s):
+    grade_char, _ = s.grade()
+    return (s.name, s.code, s.total_cw(), s.exam, s.total_score(), f"{s.percentage():.1f}%", grade_char)
+
+class _Desc:
+    """Wraps a sort key so bisect keeps a descending list."""
+    __slots__ = ('v',)
+    def __init__(self, v): self.v = v
+    def __lt__(self, other): return other.v < self.v
+    def __eq__(self, other): return self.v == other.v
+
+class TreeRows:
+    """
+    Keeps the Treeview in step with the students on screen.
+    Rows are keyed by student code, so an edit touches only its own row
+    and new rows are placed by binary search on the current sort key.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.iids = {}       # code -> Treeview item id
+        self.values = {}     # code -> values last written to that row
+        self.keyof = {}      # code -> sort key the row was placed with
+        self.keys = []       # sort keys in tree order
+        self.codes = []      # student codes in tree order
+        self.key = None      # None keeps the order the list was shown in
+        self.reverse = False
+        self.follow = False  # True while the whole roster is on screen
+        self.seq = 0
+        self.ops = 0         # Treeview calls made, read by the instrumentation
+        for g, color in GRADE_COLORS.items():
+            tree.tag_configure(f"grade_{g}", foreground=color, font=('Segoe UI', 10, 'bold'))
+
+    def row_key(self, s):
+        if self.key is None:
+            self.seq += 1
+            return (self.seq,)
+        k = (self.key(s), s.code)
+        return _Desc(k) if self.reverse else k
+
+    def show(self, students, key=None, reverse=False, follow=False):
+        """Reconciles the tree with `students`, touching only rows that changed."""
+        self.key, self.reverse, self.follow, self.seq = key, reverse, follow, 0
+        rows = [(self.row_key(s), s) for s in students]
+        if key is not None:
+            rows.sort(key=lambda r: r[0])
+        wanted = {s.code for _, s in rows}
+
+        for code in [c for c in self.iids if c not in wanted]:
+            self.tree.delete(self.iids.pop(code))
+            self.ops += 1
+            del self.values[code]
+        on_screen = [c for c in self.codes if c in wanted]
+
+        for _, s in rows:
+            vals = row_values(s)
+            iid = self.iids.get(s.code)
+            if iid is None:
+                self.iids[s.code] = self.tree.insert("", "end", values=vals, tags=(f"grade_{vals[-1]}",))
+                self.ops += 1
+                on_screen.append(s.code)
+            elif self.values[s.code] != vals:
+                self.tree.item(iid, values=vals, tags=(f"grade_{vals[-1]}",))
+                self.ops += 1
+            self.values[s.code] = vals
+
+        self.keys = [k for k, _ in rows]
+        self.codes = [s.code for _, s in rows]
+        self.keyof = dict(zip(self.codes, self.keys))
+        if on_screen != self.codes:
+            self.tree.set_children("", *(self.iids[c] for c in self.codes))
+            self.ops += 1
+
+    def _take(self, code):
+        i = bisect_left(self.keys, self.keyof.pop(code))
+        del self.keys[i], self.codes[i]
+        return i
+
+    def _place(self, s):
+        k = self.row_key(s)
+        j = bisect_left(self.keys, k)
+        self.keys.insert(j, k)
+        self.codes.insert(j, s.code)
+        self.keyof[s.code] = k
+        return j
+
+    def upsert(self, s):
+        """Adds or refreshes one student's row in sort position."""
+        iid = self.iids.get(s.code)
+        if iid is None and not self.follow:
+            return
+        vals = row_values(s)
+        tag = (f"grade_{vals[-1]}",)
+        if iid is None:
+            self.iids[s.code] = self.tree.insert("", self._place(s), values=vals, tags=tag)
+            self.ops += 1
+        else:
+            if self.key is not None:
+                i = self._take(s.code)
+                j = self._place(s)
+                if j != i:
+                    self.tree.move(iid, "", j)
+                    self.ops += 1
+            if self.values[s.code] != vals:
+                self.tree.item(iid, values=vals, tags=tag)
+                self.ops += 1
+        self.values[s.code] = vals
+
+    def remove(self, code):
+        iid = self.iids.pop(code, None)
+        if iid is None:
+            return
+        self._take(code)
+        del self.values[code]
+        self.tree.delete(iid)
+        self.ops += 1
+
+    def clear(self):
+        self.show([])
+
+# ====================== Instrumentation ======================
+class Instrumentation:
+    """
+    Opt-in timing for app actions (run with --profile or STUDENT_MANAGER_PROFILE=1).
+    Each wrapped call records its wall time, how many records it processed and
+    how many Treeview calls it made. The record count comes from `records(result)`
+    when given, otherwise from the note() calls made while the action ran. While capture is on, calls slower than
+    `slow_ms` keep their cProfile data so the last few can be written to disk.
+    """
+    def __init__(self, slow_ms=100, keep=5, history=500):
+        self.samples = deque(maxlen=history)   # (action, ms, records, tree_ops)
+        self.slow = deque(maxlen=keep)         # (action, ms, timestamp, cProfile.Profile)
+        self.slow_ms = slow_ms
+        self.capture = False
+        self.tree_ops = lambda: 0
+        self.listeners = []                    # Tk-thread callbacks, called with each sample
+        self.depth = 0
+        self.processed = 0                     # records noted by the Tk-thread action running now
+
+    def note(self, n):
+        """Counts `n` records as processed by the current Tk-thread action (and the ones around it)."""
+        self.processed += n
+
+    def wrap(self, name, fn, records=None):
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            on_tk = threading.current_thread() is threading.main_thread()
+            outer = on_tk and self.depth == 0
+            prof = cProfile.Profile() if self.capture and outer else None
+            if on_tk:
+                self.depth += 1
+                around, self.processed = (0 if outer else self.processed), 0
+            ops, start = self.tree_ops(), time.perf_counter()
+            result = None
+            if prof: prof.enable()
+            try:
+                result = fn(*args, **kwargs)
+                return result
+            finally:
+                if prof: prof.disable()
+                ms = (time.perf_counter() - start) * 1000
+                count = 0
+                if on_tk:
+                    self.depth -= 1
+                    count, self.processed = self.processed, around + self.processed
+                if records:
+                    count = records(result) if result is not None else 0
+                sample = (name, ms, count, self.tree_ops() - ops if on_tk else 0)
+                self.samples.append(sample)
+                if prof and ms >= self.slow_ms:
+                    self.slow.append((name, ms, time.strftime('%Y%m%d-%H%M%S'), prof))
+                if outer:
+                    for listener in self.listeners:
+                        listener(sample)
+        return timed
+
+    def stats(self):
+        """Per-action rows: (action, calls, mean ms, max ms, last ms, last records, last tree ops)."""
+        rows = {}
+        for name, ms, records, ops in self.samples:
+            calls, total, worst, *_ = rows.get(name, (0, 0.0, 0.0))
+            rows[name] = (calls + 1, total + ms, max(worst, ms), ms, records, ops)
+        return [(name, c, t / c, w, last, rec, ops) for name, (c, t, w, last, rec, ops) in sorted(rows.items())]
+
+    def dump(self, folder):
+        """Writes the captured slow-action profiles as .prof files; returns their paths."""
+        paths = []
+        for name, ms, stamp, prof in self.slow:
+            path = os.path.join(folder, f"{stamp}_{name}_{ms:.0f}ms.prof")
+            prof.dump_stats(path)
+            paths.append(path)
+        return paths
+
+# ====================== Dashboard ======================
+def nice_ceiling(n):
+    """Smallest 1/2/5 x 10^k that is >= n, so chart scales change only occasionally."""
+    step = 1
+    while True:
+        for m in (1, 2, 5):
+            if n <= m * step:
+                return m * step
+        step *= 10
+
+class Dashboard:
+    """
+    Grade and percentage histograms plus per-component box plots on one Canvas.
+    Every bar and box is created once; a redraw only moves the items whose
+    bins ScoreBins reported as changed (or a whole chart when its scale changes).
+    """
+    W, H, TOP, BASE = 960, 380, 70, 320
+
+    def __init__(self, root, bins, on_close=None):
+        self.win = tk.Toplevel(root)
+        self.win.title("Dashboard")
+        self.win.resizable(False, False)
+        self.canvas = tk.Canvas(self.win, width=self.W, height=self.H, bg='white', highlightthickness=0)
+        self.canvas.pack()
+        self.pending = False
+        if on_close:
+            self.win.protocol("WM_DELETE_WINDOW", lambda: (on_close(), self.win.destroy()))
+        self.bind(bins)
+
+    def charts(self):
+        # name -> (keys, count lookup, x0, x1, caption, title)
+        return {
+            'grade': ("ABCDF", self.bins.grades.__getitem__, 30, 250, str, "Grades"),
+            'band': (range(10), self.bins.bands.__getitem__, 290, 620, lambda b: f"{b * 10}", "Percentage bands"),
+        }
+
+    def bind(self, bins):
+        """Shows a (possibly different) set of bins and draws everything once."""
+        self.bins = bins
+        bins.take_dirty()
+        c = self.canvas
+        c.delete('all')
+        self.bars, self.scales, self.boxes = {}, {}, {}
+
+        for name, (keys, count, x0, x1, caption, title) in self.charts().items():
+            c.create_text((x0 + x1) / 2, 25, text=title, font=('Helvetica', 12, 'bold'), fill='#1e293b')
+            self.scales[name] = (c.create_text(x0, self.TOP - 12, anchor='w', font=('Segoe UI', 8), fill='#94a3b8'), None)
+            c.create_line(x0, self.BASE, x1, self.BASE, fill='#e2e8f0')
+            w = (x1 - x0) / len(keys)
+            for i, k in enumerate(keys):
+                color = GRADE_COLORS[k] if name == 'grade' else '#0d9488'
+                rect = c.create_rectangle(x0 + i * w + 4, self.BASE, x0 + (i + 1) * w - 4, self.BASE, fill=color, width=0)
+                label = c.create_text(x0 + (i + 0.5) * w, self.BASE, anchor='s', font=('Segoe UI', 8), fill='#475569')
+                c.create_text(x0 + (i + 0.5) * w, self.BASE + 12, text=caption(k), font=('Segoe UI', 9), fill='#64748b')
+                self.bars[(name, k)] = (rect, label, x0 + i * w + 4, x0 + (i + 1) * w - 4)
+            self.rescale(name)
+
+        c.create_text(800, 25, text="Components (% of max)", font=('Helvetica', 12, 'bold'), fill='#1e293b')
+        for i, (label, _) in enumerate(ScoreBins.COMPONENTS):
+            cx = 690 + i * 70
+            self.boxes[i] = (c.create_line(cx, 0, cx, 0, fill='#64748b'),
+                             c.create_rectangle(0, 0, 0, 0, fill='#ccfbf1', outline='#0d9488'),
+                             c.create_line(0, 0, 0, 0, fill='#0d9488', width=2), cx)
+            c.create_text(cx, self.BASE + 12, text=label, font=('Segoe UI', 9), fill='#64748b')
+            self.draw_box(i)
+
+    def draw_bar(self, name, k, count):
+        rect, label, xa, xb = self.bars[(name, k)]
+        h = count / self.scales[name][1] * (self.BASE - self.TOP)
+        self.canvas.coords(rect, xa, self.BASE - h, xb, self.BASE)
+        self.canvas.coords(label, (xa + xb) / 2, self.BASE - h - 2)
+        self.canvas.itemconfig(label, text=count or "")
+
+    def rescale(self, name):
+        """Redraws a whole chart if its scale moved; returns True when it did."""
+        keys, count = self.charts()[name][:2]
+        counts = {k: count(k) for k in keys}
+        text_id, old = self.scales[name]
+        scale = nice_ceiling(max(max(counts.values()), 1))
+        if scale == old:
+            return False
+        self.scales[name] = (text_id, scale)
+        self.canvas.itemconfig(text_id, text=f"max {scale}")
+        for k, n in counts.items():
+            self.draw_bar(name, k, n)
+        return True
+
+    def draw_box(self, i):
+        whisker, box, median, cx = self.boxes[i]
+        stats = self.bins.box(i)
+        state = 'hidden' if stats is None else 'normal'
+        for item in (whisker, box, median):
+            self.canvas.itemconfig(item, state=state)
+        if stats is None:
+            return
+        mx = ScoreBins.COMPONENTS[i][1]
+        lo, q1, med, q3, hi = (self.BASE - v / mx * (self.BASE - self.TOP) for v in stats)
+        self.canvas.coords(whisker, cx, hi, cx, lo)
+        self.canvas.coords(box, cx - 18, q3, cx + 18, q1)
+        self.canvas.coords(median, cx - 18, med, cx + 18, med)
+
+    def schedule(self):
+        """Coalesces a burst of edits into one redraw when Tk is next idle."""
+        if not self.pending:
+            self.pending = True
+            self.win.after_idle(self.refresh)
+
+    def refresh(self):
+        self.pending = False
+        if not self.win.winfo_exists():
+            return
+        charts = self.charts()
+        dirty = self.bins.take_dirty()
+        for name in {n for n, _ in dirty if n != 'box'}:
+            if self.rescale(name):
+                continue   # the whole chart was just redrawn at the new scale
+            for n, k in dirty:
+                if n == name:
+                    self.draw_bar(name, k, charts[name][1](k))
+        for n, i in dirty:
+            if n == 'box':
+                self.draw_box(i)
+
 # ====================== Main App - Clean & Professional ======================
 class StudentManagerApp:
-    def __init__(self, root):
+    # Actions timed when instrumentation is switched on
+    TIMED_ACTIONS = ("view_all", "view_individual", "show_highest", "show_lowest", "sort_records",
+                     "add_student", "delete_student", "update_student", "show_ranked", "show_range",
+                     "import_file", "export_file", "switch_cohort", "open_cohort", "display_students",
+                     "merge_external")
+
+    def __init__(self, root, instrumentation=None):
         self.root = root
+        self.instr = instrumentation
+        if self.instr:
+            for name in self.TIMED_ACTIONS:
+                setattr(self, name, self.instr.wrap(name, getattr(self, name)))
         self.root.title("Student Manager")
         self.root.geometry("1180x720")
         self.root.minsize(1000, 600)
         self.root.configure(bg="#f4f8fb")
 
-        self.students = load_students()
+        self.path = FILENAME
+        self.workspace = None
+        self.dashboard = None
+        self.store = StudentStore(load_students())
+        self.students = self.store.students
+        self.store.listeners.append(self.on_store_change)
 
         self.style = ttk.Style()
         self.style.theme_use('clam')
         self.configure_styles()
 
         self.create_widgets()
+        if self.instr:
+            # Treeview calls and the status bar only exist once the widgets do
+            self.instr.tree_ops = lambda: self.rows.ops
+            self.instr.listeners.append(self.show_sample)
+        self.create_menubar()
         self.show_summary()
 
+        self.start_saver()
+        self.watcher = MarksWatcher(self.path, self.students)
+        self.unsaved = Counter()        # codes with local edits the worker has not written yet
+        self.merging = False
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.poll_saves()
+        self.poll_file()
+
     def configure_styles(self):
         # Clean, modern colors
         self.colors = {
@@ -160,12 +1015,299 @@ class StudentManagerApp:
         self.tree.configure(yscrollcommand=scrollbar.set)
         self.tree.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
+        self.rows = TreeRows(self.tree)
 
         # Status bar
         self.status = tk.Label(self.root, text="Ready", anchor='w', bg='#e0f2fe', fg=self.colors['text'],
                                font=('Segoe UI', 10), padx=20, relief='flat')
         self.status.pack(side='bottom', fill='x')
 
+    def create_menubar(self):
+        menubar = tk.Menu(self.root)
+        files = tk.Menu(menubar, tearoff=0)
+        files.add_command(label="Import Marks…", command=self.import_file)
+        files.add_command(label="Export Marks…", command=self.export_file)
+        menubar.add_cascade(label="File", menu=files)
+        ranks = tk.Menu(menubar, tearoff=0)
+        ranks.add_command(label="Top N Students…", command=lambda: self.show_ranked(top=True))
+        ranks.add_command(label="Bottom N Students…", command=lambda: self.show_ranked(top=False))
+        ranks.add_command(label="Percentage Range…", command=self.show_range)
+        menubar.add_cascade(label="Rankings", menu=ranks)
+        view = tk.Menu(menubar, tearoff=0)
+        view.add_command(label="Dashboard", command=self.open_dashboard)
+        menubar.add_cascade(label="View", menu=view)
+        if self.instr:
+            prof = tk.Menu(menubar, tearoff=0)
+            prof.add_command(label="Action Stats…", command=self.open_action_stats)
+            self.capture_var = tk.BooleanVar(value=False)
+            prof.add_checkbutton(label="Capture Slow Actions (cProfile)", variable=self.capture_var,
+                                 command=lambda: setattr(self.instr, 'capture', self.capture_var.get()))
+            prof.add_command(label="Save Slow Profiles…", command=self.save_profiles)
+            menubar.add_cascade(label="Profiler", menu=prof)
+        work = tk.Menu(menubar, tearoff=0)
+        work.add_command(label="Open Cohort Folder…", command=self.open_workspace)
+        work.add_command(label="Switch Cohort…", command=self.choose_cohort)
+        work.add_command(label="Student Across Cohorts…", command=self.cross_cohort)
+        menubar.add_cascade(label="Workspace", menu=work)
+        self.root.config(menu=menubar)
+
+    # --- Workspace ---
+    def open_workspace(self):
+        folder = filedialog.askdirectory(title="Folder of cohort mark files")
+        if not folder: return
+        self.workspace = Workspace(folder)
+        if not self.workspace.files:
+            messagebox.showwarning("Workspace", "No .txt mark files in that folder.")
+            self.workspace = None
+            return
+        self.status.config(text=f"Workspace: {len(self.workspace.files)} cohorts • indexing students in the background")
+        self.choose_cohort()
+
+    def choose_cohort(self):
+        if not self.workspace:
+            messagebox.showinfo("Workspace", "Open a cohort folder first.")
+            return
+        win = tk.Toplevel(self.root)
+        win.title("Cohorts")
+        win.geometry("320x420")
+        box = tk.Listbox(win, font=('Segoe UI', 10), activestyle='none')
+        box.pack(fill='both', expand=True, padx=10, pady=10)
+        for path in self.workspace.files:
+            box.insert('end', os.path.basename(path))
+
+        def pick(_=None):
+            sel = box.curselection()
+            if sel:
+                win.destroy()
+                self.switch_cohort(self.workspace.files[sel[0]])
+
+        box.bind("<Double-Button-1>", pick)
+        ttk.Button(win, text="Open", style='Action.TButton', command=pick).pack(fill='x', padx=10, pady=(0, 10))
+
+    def switch_cohort(self, path):
+        if path == self.path: return
+        error = self.stop_saver()
+        if error and not messagebox.askyesno("Save Error", f"{error}\n\nSwitch cohort anyway?"):
+            self.start_saver(self.saver.unwritten)
+            return
+        try:
+            store = self.open_cohort(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Load Error", f"Could not read cohort:\n{e}")
+            self.start_saver(self.saver.unwritten)
+            return
+        self.store.listeners.remove(self.on_store_change)
+        self.path, self.store, self.students = path, store, store.students
+        store.listeners.append(self.on_store_change)
+        if self.dashboard:
+            self.dashboard.bind(store.bins)
+        self.start_saver()
+        self.watcher = MarksWatcher(path, self.students)
+        self.watcher.sig = None   # a cached cohort may be older than the file: diff it on the next poll
+        self.unsaved.clear()
+        self.root.title(f"Student Manager — {os.path.basename(path)}")
+        self.display_students(self.students, follow=True)
+
+    def open_cohort(self, path):
+        store = self.workspace.open(path)
+        self.count_records(len(store))
+        return store
+
+    def count_records(self, n):
+        """Tells the instrumentation (if on) how many records the current action handled."""
+        if self.instr:
+            self.instr.note(n)
+
+    def cross_cohort(self):
+        if not self.workspace:
+            messagebox.showinfo("Workspace", "Open a cohort folder first.")
+            return
+        if not self.workspace.index_ready.is_set():
+            messagebox.showinfo("Workspace", "Still indexing cohorts, try again in a moment.")
+            return
+        code = simpledialog.askinteger("Across Cohorts", "Student ID:", minvalue=1000, maxvalue=9999)
+        if not code: return
+        found = self.workspace.results_for(code)
+        if not found:
+            messagebox.showwarning("Not Found", f"Student {code} is not in any cohort.")
+            return
+
+        win = tk.Toplevel(self.root)
+        win.title(f"Student {code} — all cohorts")
+        win.geometry("720x300")
+        cols = ("Cohort", "Name", "CW Total", "Exam", "Percentage", "Grade")
+        tree = ttk.Treeview(win, columns=cols, show='headings', style='Clean.Treeview')
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, anchor='center', width=100)
+        tree.column("Cohort", width=180, anchor='w')
+        tree.column("Name", width=160, anchor='w')
+        tree.pack(fill='both', expand=True, padx=10, pady=10)
+        for path, s in found:
+            tree.insert("", "end", values=(os.path.basename(path), s.name, s.total_cw(), s.exam,
+                                           f"{s.percentage():.1f}%", s.grade()[0]))
+
+    FILE_TYPES = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Student marks", "*.txt")]
+
+    def import_file(self):
+        path = filedialog.askopenfilename(title="Import Marks", filetypes=self.FILE_TYPES + [("All files", "*.*")])
+        if not path: return
+        try:
+            added, errors = import_students(self.store, path)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            messagebox.showerror("Import Error", f"Could not read file:\n{e}")
+            return
+        if errors:
+            lines = "\n".join(f"Line {n}: {msg}" for n, msg in errors[:15])
+            more = f"\n…and {len(errors) - 15} more" if len(errors) > 15 else ""
+            messagebox.showerror("Import Rejected", f"{len(errors)} problem(s) found, nothing was imported.\n\n{lines}{more}")
+            return
+        self.update_summary()
+        self.status.config(text=f"Imported {len(added)} students from {os.path.basename(path)}")
+
+    def export_file(self):
+        path = filedialog.asksaveasfilename(title="Export Marks", defaultextension=".csv", filetypes=self.FILE_TYPES)
+        if not path: return
+        try:
+            export_students(self.students, path)
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export:\n{e}")
+            return
+        self.count_records(len(self.students))
+        self.status.config(text=f"Exported {len(self.students)} students to {os.path.basename(path)}")
+
+    # --- Instrumentation ---
+    def show_sample(self, sample):
+        name, ms, records, ops = sample
+        self.status.config(text=f"{name}: {ms:.1f} ms • {records} records • {ops} tree ops", fg=self.colors['text'])
+
+    def open_action_stats(self):
+        win = tk.Toplevel(self.root)
+        win.title("Action Stats")
+        win.geometry("760x320")
+        cols = ("Action", "Calls", "Mean ms", "Max ms", "Last ms", "Records", "Tree ops")
+        tree = ttk.Treeview(win, columns=cols, show='headings')
+        for col in cols:
+            tree.heading(col, text=col)
+            tree.column(col, anchor='center', width=90)
+        tree.column("Action", width=160, anchor='w')
+        tree.pack(fill='both', expand=True, padx=10, pady=10)
+
+        def refresh():
+            if not win.winfo_exists(): return
+            tree.delete(*tree.get_children())   # a few dozen rows at most
+            for name, calls, mean, worst, last, records, ops in self.instr.stats():
+                tree.insert("", "end", values=(name, calls, f"{mean:.1f}", f"{worst:.1f}", f"{last:.1f}", records, ops))
+            win.after(1000, refresh)
+        refresh()
+
+    def save_profiles(self):
+        if not self.instr.slow:
+            messagebox.showinfo("Profiler", f"No captured actions slower than {self.instr.slow_ms} ms yet.\n"
+                                            "Turn on 'Capture Slow Actions' first.")
+            return
+        folder = filedialog.askdirectory(title="Folder for .prof files")
+        if not folder: return
+        paths = self.instr.dump(folder)
+        self.status.config(text=f"Wrote {len(paths)} profile(s) to {folder}")
+
+    def open_dashboard(self):
+        if self.dashboard:
+            self.dashboard.win.lift()
+            return
+        self.dashboard = Dashboard(self.root, self.store.bins, on_close=lambda: setattr(self, 'dashboard', None))
+
+    def on_store_change(self, kind, s):
+        self.count_records(1)
+        if kind == 'remove': self.rows.remove(s.code)
+        else: self.rows.upsert(s)
+        if self.dashboard:
+            self.dashboard.schedule()
+        if self.workspace and kind != 'update':
+            self.workspace.note(self.path, kind, s)
+        if self.merging:
+            return   # came from the file, nothing to write back
+        line = None if kind == 'remove' else record_line(s)
+        self.saver.notify(s.code, line)
+        self.watcher.track(s.code, line)
+        self.unsaved[s.code] += 1
+
+    def poll_saves(self):
+        try:
+            while True:
+                ok, msg, changes = self.saver.results.get_nowait()
+                if ok:
+                    self.unsaved -= Counter(code for code, _ in changes)
+                    for code, line in changes:
+                        self.watcher.track(code, line)   # our own write is not an external change
+                self.status.config(text=msg, fg=self.colors['text'] if ok else '#dc2626')
+        except queue.Empty:
+            pass
+        self.root.after(250, self.poll_saves)
+
+    def poll_file(self):
+        """Merges records other users saved to the shared file, one changed record at a time."""
+        try:
+            diff = self.watcher.poll()
+        except OSError:
+            diff = None
+        if diff:
+            changed, removed = diff
+            self.merging = True
+            try:
+                n = self.merge_external(changed, removed)
+            finally:
+                self.merging = False
+            if n:
+                self.update_summary()
+                self.status.config(text=f"Merged {n} change(s) made by another user", fg=self.colors['text'])
+        self.root.after(1500, self.poll_file)
+
+    def merge_external(self, changed, removed):
+        n = 0
+        for code in removed:
+            s = self.store.by_code.get(code)
+            if s and not self.unsaved[code]:
+                self.store.remove(s)
+                n += 1
+        for code, line in changed.items():
+            if self.unsaved[code]:
+                continue   # our pending edit wins; it will be written shortly
+            s = self.store.by_code.get(code)
+            if s is not None and record_line(s) == line:
+                continue   # the file caught up with what we already show (e.g. our own save)
+            try:
+                new = Student(*line.split(','))
+            except ValueError:
+                continue
+            if s is None:
+                self.store.add(new)
+            else:
+                s.name, s.cw, s.exam = new.name, new.cw, new.exam
+                self.store.update(s)
+            n += 1
+        return n
+
+    def start_saver(self, unwritten=()):
+        """Starts a save worker; `unwritten` carries over the changes a failed worker could not store."""
+        self.saver = SaveWorker(self.path, self.students, unwritten=unwritten)
+
+    def stop_saver(self):
+        """Flushes and stops the save worker; returns the last error message, if the final write failed."""
+        self.status.config(text="Saving…")
+        self.saver.close()
+        last = None
+        while not self.saver.results.empty():
+            last = self.saver.results.get()
+        return last[1] if last and not last[0] else None
+
+    def on_close(self):
+        error = self.stop_saver()
+        if error and not messagebox.askyesno("Save Error", f"{error}\n\nClose anyway?"):
+            self.start_saver(self.saver.unwritten)
+            return
+        self.root.destroy()
+
     def update_summary(self):
         for widget in self.summary_frame.winfo_children():
             widget.destroy()
@@ -174,8 +1316,8 @@ class StudentManagerApp:
             return
 
         total = len(self.students)
-        avg = sum(s.percentage() for s in self.students) / total
-        top = max(self.students, key=lambda s: s.percentage())
+        avg = self.store.rank.average()
+        top = self.store.rank.top(1)[0]
 
         stats = [
             ("Total Students", str(total), "#64748b"),
@@ -192,16 +1334,15 @@ class StudentManagerApp:
             tk.Label(card, text=value, font=('Helvetica', 18, 'bold'), fg=color, bg='#f8fafc').pack(pady=(0, 10))
 
     def show_summary(self):
-        self.tree.delete(*self.tree.get_children())
         self.update_summary()
         self.status.config(text=f"Loaded {len(self.students)} student records • Ready")
 
     def clear_tree(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self.rows.clear()
 
-    def display_students(self, student_list):
-        self.clear_tree()
+    def display_students(self, student_list, key=None, reverse=False, follow=False):
+        self.count_records(len(student_list))
+        self.rows.show(student_list, key=key, reverse=reverse, follow=follow)
         self.update_summary()
 
         if not student_list:
@@ -209,42 +1350,24 @@ class StudentManagerApp:
             return
 
         avg = sum(s.percentage() for s in student_list) / len(student_list)
-
-        for s in student_list:
-            grade_char, color = s.grade()
-            perc = s.percentage()
-            tag = f"grade_{grade_char}"
-            self.tree.tag_configure(tag, foreground=color, font=('Segoe UI', 10, 'bold'))
-
-            self.tree.insert("", "end", values=(
-                s.name,
-                s.code,
-                s.total_cw(),
-                s.exam,
-                s.total_score(),
-                f"{perc:.1f}%",
-                grade_char
-            ), tags=(tag,))
-
         self.status.config(text=f"Showing {len(student_list)} students • Average: {avg:.1f}%")
 
     def view_all(self):
-        self.display_students(self.students)
+        self.display_students(self.students, follow=True)
 
     def view_individual(self):
         query = simpledialog.askstring("Search", "Enter Student ID or Name:")
         if not query: return
-        query = query.strip()
+        results = self.store.search(query)
 
-        found = None
-        for s in self.students:
-            if str(s.code) == query or query.lower() in s.name.lower():
-                found = s
-                break
-
-        if found:
+        if len(results) == 1:
+            found = results[0]
             self.display_students([found])
-            self.status.config(text=f"Found: {found.name} • Grade {found.grade()[0]}")
+            self.status.config(text=f"Found: {found.name} • Grade {found.grade()[0]} • "
+                                    f"{self.store.rank.percentile(found):.0f}th percentile")
+        elif results:
+            self.display_students(results)
+            self.status.config(text=f"{len(results)} matches for '{query.strip()}' • best match first")
         else:
             messagebox.showwarning("Not Found", "No student matches your search.")
 
@@ -252,7 +1375,7 @@ class StudentManagerApp:
         if not self.students:
             messagebox.showinfo("Empty", "No records available.")
             return
-        best = max(self.students, key=lambda s: s.percentage())
+        best = self.store.rank.top(1)[0]
         self.display_students([best])
         self.status.config(text=f"Top performer: {best.name} — {best.percentage():.1f}%")
 
@@ -260,10 +1383,32 @@ class StudentManagerApp:
         if not self.students:
             messagebox.showinfo("Empty", "No records available.")
             return
-        worst = min(self.students, key=lambda s: s.percentage())
+        worst = self.store.rank.bottom(1)[0]
         self.display_students([worst])
         self.status.config(text=f"Lowest score: {worst.name} — {worst.percentage():.1f}%")
 
+    def show_ranked(self, top=True):
+        if not self.students:
+            messagebox.showinfo("Empty", "No records available.")
+            return
+        k = simpledialog.askinteger("Rankings", "How many students?", minvalue=1, maxvalue=len(self.students), initialvalue=10)
+        if not k: return
+        picked = self.store.rank.top(k) if top else self.store.rank.bottom(k)
+        self.display_students(picked)
+        self.status.config(text=f"{'Top' if top else 'Bottom'} {len(picked)} of {len(self.students)} students")
+
+    def show_range(self):
+        if not self.students:
+            messagebox.showinfo("Empty", "No records available.")
+            return
+        lo = simpledialog.askfloat("Range", "From percentage:", minvalue=0, maxvalue=100, initialvalue=0)
+        if lo is None: return
+        hi = simpledialog.askfloat("Range", "To percentage:", minvalue=lo, maxvalue=100, initialvalue=100)
+        if hi is None: return
+        picked = self.store.rank.between(lo, hi)
+        self.display_students(picked)
+        self.status.config(text=f"{len(picked)} students between {lo:g}% and {hi:g}%")
+
     def sort_records(self):
         if not self.students: return
         choice = simpledialog.askstring("Sort", "Sort by:\n1. Name\n2. ID\n3. Percentage\n\nEnter 1, 2, or 3:")
@@ -273,12 +1418,13 @@ class StudentManagerApp:
         reverse = messagebox.askyesno("Order", "Descending? (Highest/Last first)")
 
         key_map = {"1": lambda s: s.name.lower(), "2": lambda s: s.code, "3": lambda s: s.percentage()}
-        sorted_list = sorted(self.students, key=key_map[choice], reverse=reverse)
-        self.display_students(sorted_list)
+        # The rank index already holds students in score order, so the percentage sort is near-linear
+        source = list(self.store.rank.ascending()) if choice == "3" else self.students
+        self.display_students(source, key=key_map[choice], reverse=reverse, follow=True)
 
     def add_student(self):
         code = simpledialog.askinteger("Add", "Student ID (1000–9999):", minvalue=1000, maxvalue=9999)
-        if not code or any(s.code == code for s in self.students):
+        if not code or code in self.store.by_code:
             messagebox.showerror("Error", "Invalid or duplicate ID")
             return
         name = simpledialog.askstring("Add", "Full Name:")
@@ -299,8 +1445,7 @@ class StudentManagerApp:
         exam = ask("Exam Mark (0–100):", 100)
         if exam is None: return
 
-        self.students.append(Student(code, name, cw1, cw2, cw3, exam))
-        save_students(self.students)
+        self.store.add(Student(code, name, cw1, cw2, cw3, exam))
         messagebox.showinfo("Success", f"Student '{name}' added successfully")
         self.show_summary()
 
@@ -308,8 +1453,7 @@ class StudentManagerApp:
         s = self.find_student()
         if not s: return
         if messagebox.askyesno("Delete", f"Delete {s.name} ({s.code}) permanently?"):
-            self.students.remove(s)
-            save_students(self.students)
+            self.store.remove(s)
             messagebox.showinfo("Deleted", "Record removed")
             self.show_summary()
 
@@ -333,23 +1477,38 @@ class StudentManagerApp:
             new = simpledialog.askinteger("Update", "New Exam Mark (0–100):", minvalue=0, maxvalue=100)
             if new is not None: s.exam = new
 
-        save_students(self.students)
+        self.store.update(s)
         messagebox.showinfo("Updated", "Record updated successfully")
         self.show_summary()
 
     def find_student(self):
         query = simpledialog.askstring("Search", "Enter Student ID or Name:")
         if not query: return None
-        query = query.strip()
+        results = self.store.search(query)
 
-        for s in self.students:
-            if str(s.code) == query or query.lower() in s.name.lower():
-                return s
-        messagebox.showwarning("Not Found", "Student not found")
-        return None
+        if not results:
+            messagebox.showwarning("Not Found", "Student not found")
+            return None
+        if len(results) == 1:
+            return results[0]
+        # Several close matches: list them and let the user pick by ID
+        self.display_students(results)
+        listed = {s.code: s for s in results}
+        while True:
+            code = simpledialog.askinteger("Select", f"{len(results)} students match. Enter the Student ID from the list:")
+            if code is None:
+                return None
+            if code in listed:
+                return listed[code]
+            messagebox.showwarning("Not Listed", f"{code} is not one of the matching students.")
 
 # ====================== Launch ======================
 if __name__ == "__main__":
+    instr = None
+    if "--profile" in sys.argv or os.environ.get("STUDENT_MANAGER_PROFILE") == "1":
+        instr = Instrumentation()
+        load_students = instr.wrap("load_students", load_students, records=len)
+        SaveWorker.flush = instr.wrap("save", SaveWorker.flush, records=lambda written: written)
     root = tk.Tk()
-    app = StudentManagerApp(root)
+    app = StudentManagerApp(root, instr)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Benchmarks for the Student Manager data paths (ex3.py).
+
+Generates synthetic studentMarks.txt files and times parsing, lookup, sorting,
+aggregate statistics, saving and Treeview population, with the peak memory of
+each operation. Results can be stored as a baseline; later runs fail (exit
+code 1) when an operation gets slower than the baseline by more than the
+tolerance.
+
+    python ex3_bench.py                              # 1k, 10k and 100k rows
+    python ex3_bench.py --sizes 1000 1000000         # up to a million rows
+    python ex3_bench.py --save-baseline              # record this machine's numbers
+    python ex3_bench.py --tolerance 0.3              # fail on >30% regressions
+
+The Treeview step needs a display; on a headless machine it starts Xvfb when
+it is installed and is skipped otherwise.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ex3
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+NOISE_FLOOR = 0.005   # seconds; differences below this are never treated as regressions
+
+FIRST = ["Amy", "Ben", "Cara", "Dev", "Ella", "Finn", "Gita", "Hugo", "Isla", "Jack", "Kemi", "Liam",
+         "Maya", "Noah", "Omar", "Priya", "Quinn", "Rosa", "Sam", "Tara", "Umar", "Vera", "Will", "Zoe"]
+LAST = ["Adams", "Brown", "Curry", "Davies", "Evans", "Fisher", "Green", "Hughes", "Iqbal", "Jones",
+        "Khan", "Lewis", "Morgan", "Nolan", "Owen", "Patel", "Quinn", "Roberts", "Scott", "Taylor"]
+
+# ====================== Synthetic Data ======================
+def generate(path, rows, seed=0):
+    """Writes a studentMarks.txt-format file. Codes go beyond 9999 for big files so they stay unique."""
+    rnd = random.Random(seed)
+    with open(path, 'w') as f:
+        f.write(f"{rows}\n")
+        for i in range(rows):
+            f.write(f"{1000 + i},{rnd.choice(FIRST)} {rnd.choice(LAST)}{i % 97},"
+                    f"{rnd.randint(0, 20)},{rnd.randint(0, 20)},{rnd.randint(0, 20)},{rnd.randint(0, 100)}\n")
+
+# ====================== Timing ======================
+def measure(fn, repeats, memory):
+    """Best wall time over `repeats` runs, plus peak traced memory of one extra run."""
+    best = float('inf')
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return best, peak
+
+def start_display():
+    """Returns a Tk root, starting Xvfb on headless machines when it is available (else None)."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        if not shutil.which("Xvfb"):
+            return None, None
+        # -displayfd makes Xvfb pick a free display and report it once it is ready
+        ready, report = os.pipe()
+        xvfb = subprocess.Popen(["Xvfb", "-displayfd", str(report), "-screen", "0", "1280x1024x24"],
+                                pass_fds=(report,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.close(report)
+        with os.fdopen(ready) as f:
+            display = f.readline().strip()
+        if not display:
+            xvfb.wait()
+            return None, None
+        os.environ["DISPLAY"] = f":{display}"
+        try:
+            root = tk.Tk()
+        except tk.TclError:
+            xvfb.terminate()
+            return None, None
+        root.withdraw()
+        return root, xvfb
+    root.withdraw()
+    return root, None
+
+def bench_size(rows, workdir, repeats, memory, root):
+    path = os.path.join(workdir, f"marks_{rows}.txt")
+    generate(path, rows)
+    students = list(ex3.iter_students(path))
+    store = ex3.StudentStore(students)
+    rnd = random.Random(1)
+    probes = [s.name for s in rnd.sample(students, min(50, rows))]
+    codes = [s.code for s in rnd.sample(students, min(1000, rows))]
+    out = os.path.join(workdir, "saved.txt")
+    ex3.save_students(students, out)
+    saver = ex3.SaveWorker(out, students)
+    edited = students[len(students) // 2]
+
+    ops = {
+        "parse": lambda: list(ex3.iter_students(path)),
+        "index": lambda: ex3.StudentStore(students),
+        "lookup_code": lambda: [store.by_code[c] for c in codes],
+        "search_fuzzy": lambda: [store.search(q[:-1]) for q in probes],
+        "sort_name": lambda: sorted(students, key=lambda s: (s.name.lower(), s.code)),
+        "sort_rank": lambda: list(store.rank.ascending()),
+        "stats": lambda: (store.rank.average(), store.rank.top(10), store.rank.between(40, 60),
+                          [store.bins.box(i) for i in range(4)]),
+        "save": lambda: saver.flush([(edited.code, ex3.record_line(edited))]),   # one edit, as the app saves it
+    }
+    if root is not None:
+        from tkinter import ttk
+
+        def populate():
+            tree = ttk.Treeview(root, columns=("Name", "ID", "CW Total", "Exam", "Total", "Percentage", "Grade"),
+                                show='headings')
+            ex3.TreeRows(tree).show(students)
+            tree.destroy()
+        ops["treeview"] = populate
+
+    results = {}
+    try:
+        for name, fn in ops.items():
+            seconds, peak = measure(fn, repeats, memory)
+            results[name] = {"seconds": seconds, "peak_bytes": peak}
+    finally:
+        saver.close()
+    return results
+
+# ====================== Reporting ======================
+def report(all_results, baseline, tolerance):
+    """Prints a table and returns the list of regressions against `baseline`."""
+    regressions = []
+    print(f"{'rows':>9}  {'operation':<13} {'time':>10} {'peak mem':>10}  baseline")
+    for rows, results in all_results.items():
+        for op, r in results.items():
+            base = baseline.get(rows, {}).get(op)
+            note = ""
+            if base is not None:
+                ratio = r["seconds"] / base if base else float('inf')
+                note = f"{ratio:5.2f}x"
+                if r["seconds"] > base * (1 + tolerance) and r["seconds"] - base > NOISE_FLOOR:
+                    regressions.append((rows, op, base, r["seconds"]))
+                    note += "  REGRESSION"
+            peak = f"{r['peak_bytes'] / 1e6:8.1f}MB" if r["peak_bytes"] is not None else f"{'-':>10}"
+            print(f"{rows:>9}  {op:<13} {r['seconds'] * 1000:8.1f}ms {peak}  {note}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Student Manager load, search, sort and save paths.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="allowed slowdown, 0.5 = 50%%")
+    args = parser.parse_args(argv)
+
+    root, xvfb = start_display()
+    if root is None:
+        print("No display available: Treeview population is skipped.\n")
+    try:
+        with tempfile.TemporaryDirectory() as workdir:
+            all_results = {str(n): bench_size(n, workdir, args.repeats, not args.no_memory, root)
+                           for n in args.sizes}
+    finally:
+        if root is not None:
+            root.destroy()
+        if xvfb is not None:
+            xvfb.terminate()
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    regressions = report(all_results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({rows: {op: r["seconds"] for op, r in results.items()}
+                       for rows, results in all_results.items()}, f, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%}:")
+        for rows, op, base, now in regressions:
+            print(f"  {op} @ {rows} rows: {base * 1000:.1f}ms -> {now * 1000:.1f}ms")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
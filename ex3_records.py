@@ -0,0 +1,231 @@
+"""
+Student records without any GUI: the Student class, the studentMarks.txt,
+CSV and JSON Lines readers and writers, import validation and the shared
+file lock. ex3.py builds the Student Manager on top of this module, and the
+headless ex3_report.py uses it without importing tkinter.
+"""
+import os
+import csv
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+try:
+    import fcntl            # POSIX advisory locks
+except ImportError:
+    fcntl = None
+    import msvcrt           # Windows byte-range locks
+
+# ====================== Student Class ======================
+GRADE_COLORS = {'A': '#16a34a', 'B': '#2563eb', 'C': '#7c3aed', 'D': '#d97706', 'F': '#dc2626'}
+
+class Student:
+    def __init__(self, code, name, cw1, cw2, cw3, exam):
+        self.code = int(code)
+        self.name = name.strip()
+        self.cw = [int(cw1), int(cw2), int(cw3)]
+        self.exam = int(exam)
+
+    def total_cw(self): return sum(self.cw)
+    def total_score(self): return self.total_cw() + self.exam
+    def percentage(self): return (self.total_score() / 160) * 100
+
+    def grade(self):
+        p = self.percentage()
+        if p >= 70: g = 'A'
+        elif p >= 60: g = 'B'
+        elif p >= 50: g = 'C'
+        elif p >= 40: g = 'D'
+        else: g = 'F'
+        return g, GRADE_COLORS[g]
+
+# ====================== File Handling ======================
+FILENAME = "studentMarks.txt"
+
+def iter_students(path=FILENAME):
+    """Streams students from a marks file; the first non-blank line is the class size."""
+    with open(path, 'r') as f:
+        header_seen = False
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not header_seen:
+                header_seen = True
+                continue
+            parts = line.split(',')
+            if len(parts) == 6:
+                code, name, c1, c2, c3, exam = parts
+                yield Student(code, name, c1, c2, c3, exam)
+
+# ====================== Bulk Import / Export ======================
+FIELDS = ("code", "name", "cw1", "cw2", "cw3", "exam")
+LIMITS = {"code": (1000, 9999), "cw1": (0, 20), "cw2": (0, 20), "cw3": (0, 20), "exam": (0, 100)}
+
+def read_records(path):
+    """
+    Streams raw (line_no, fields) rows from a CSV, JSON Lines or studentMarks.txt file.
+    The format is picked from the file extension; nothing is validated here.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if ext == '.csv':
+            for n, row in enumerate(csv.reader(f), 1):
+                if not row or (n == 1 and not row[0].strip().isdigit()):
+                    continue   # blank line or header row
+                yield n, row
+        elif ext in ('.jsonl', '.json', '.ndjson'):
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    rec = None
+                if not isinstance(rec, dict):
+                    yield n, None   # not JSON, or JSON that is not an object
+                    continue
+                cw = rec.get("cw") or [rec.get("cw1"), rec.get("cw2"), rec.get("cw3")]
+                if not isinstance(cw, list):
+                    yield n, None
+                    continue
+                yield n, [rec.get("code"), rec.get("name"), *cw, rec.get("exam")]
+        else:
+            header_seen = False
+            for n, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                if not header_seen:
+                    header_seen = True   # first non-blank line is the student count
+                    continue
+                yield n, line.strip().split(',')
+
+VALIDATE_BATCH = 4096   # rows checked together, one column at a time
+
+def whole_number(v):
+    try:
+        return int(str(v).strip())
+    except ValueError:
+        return None
+
+def check_records(rows, existing_codes=()):
+    """
+    Validates rows in batches of VALIDATE_BATCH, yielding (line_no, student, None) for
+    a good row and (line_no, None, message) for a bad one, in file order. Duplicates are
+    checked against `existing_codes` and within the rows themselves. A row of None is a
+    record read_records() could not make sense of.
+    """
+    seen = set()
+    rows = iter(rows)
+    while True:
+        batch = list(islice(rows, VALIDATE_BATCH))
+        if not batch:
+            return
+        yield from check_batch(batch, existing_codes, seen)
+
+def check_batch(batch, existing_codes, seen):
+    """
+    One batch, checked column-wise: each field is converted and range-checked for the
+    whole batch in a single pass over its column. Only the duplicate check, which
+    depends on the rows before it, walks the rows in order.
+    """
+    shape = ["not a valid record" if row is None else
+             f"expected {len(FIELDS)} fields" if len(row) != len(FIELDS) else None
+             for _, row in batch]
+    blank = (None,) * len(FIELDS)
+    columns = dict(zip(FIELDS, zip(*(row if error is None else blank for (_, row), error in zip(batch, shape)))))
+    names = [name.strip() if isinstance(name, str) else "" for name in columns.pop("name")]
+    nums = {k: [whole_number(v) for v in col] for k, col in columns.items()}
+    numeric = [None not in row for row in zip(*nums.values())]
+    bad_names = [not name or ',' in name for name in names]
+    out_of_range = {k: [v is not None and not lo <= v <= hi for v in nums[k]] for k, (lo, hi) in LIMITS.items()}
+
+    for i, (n, _) in enumerate(batch):
+        if shape[i]:
+            yield n, None, shape[i]
+            continue
+        if not numeric[i]:
+            yield n, None, "marks and code must be whole numbers"
+            continue
+        bad = [k for k in LIMITS if out_of_range[k][i]]
+        code = nums["code"][i]
+        if bad:
+            yield n, None, "out of range: " + ", ".join(bad)
+        elif bad_names[i]:
+            yield n, None, "name is empty or contains a comma"
+        elif code in existing_codes or code in seen:
+            yield n, None, f"duplicate student code {code}"
+        else:
+            seen.add(code)
+            yield n, Student(code, names[i], nums["cw1"][i], nums["cw2"][i], nums["cw3"][i], nums["exam"][i]), None
+
+def validate_records(rows, existing_codes):
+    """Checks a whole batch in one pass. Returns (students, errors) where errors is a list of (line_no, message)."""
+    students, errors = [], []
+    for n, s, error in check_records(rows, existing_codes):
+        if error: errors.append((n, error))
+        else: students.append(s)
+    return students, errors
+
+def export_students(students, path):
+    """Streams students to CSV, JSON Lines or the studentMarks.txt format (by extension)."""
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if ext == '.csv':
+            w = csv.writer(f)
+            w.writerow(FIELDS)
+            w.writerows((s.code, s.name, *s.cw, s.exam) for s in students)
+        elif ext in ('.jsonl', '.json', '.ndjson'):
+            for s in students:
+                f.write(json.dumps({"code": s.code, "name": s.name, "cw": s.cw, "exam": s.exam}) + "\n")
+        else:
+            f.write(f"{len(students)}\n")
+            for s in students:
+                f.write(f"{s.code},{s.name},{s.cw[0]},{s.cw[1]},{s.cw[2]},{s.exam}\n")
+
+# ====================== Shared File Access ======================
+def record_line(s):
+    return f"{s.code},{s.name},{s.cw[0]},{s.cw[1]},{s.cw[2]},{s.exam}"
+
+def record_code(line):
+    head = line.split(',', 1)[0].strip()
+    return int(head) if head.isdigit() else None
+
+@contextmanager
+def file_lock(path, blocking=True):
+    """
+    Advisory lock on `path` shared by every Student Manager process (held on a side .lock file).
+    With blocking=False the lock is only taken when it is free; the `with` value says whether it was.
+    """
+    with open(f"{path}.lock", 'a+') as f:
+        try:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        except OSError:
+            if blocking:
+                raise
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def read_record_lines(path):
+    """{code: line} for every well-formed record in the file, in file order."""
+    records = {}
+    with open(path, 'r') as f:
+        next(f, None)   # student count
+        for line in f:
+            line = line.strip()
+            code = record_code(line) if line.count(',') == 5 else None
+            if code is not None:
+                records[code] = line
+    return records
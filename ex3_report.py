@@ -0,0 +1,163 @@
+"""
+Headless reports for student marks files - no Tk window or display needed.
+
+Uses the same file readers and validation as ex3.py, so the numbers match
+what the Student Manager shows. They come from ex3_records.py, which does not
+import tkinter, so neither this tool nor its worker processes load the GUI
+stack. Each file is streamed once; a directory of cohort files is analysed
+in parallel across CPU cores.
+
+    python ex3_report.py studentMarks.txt
+    python ex3_report.py cohorts/ --format csv --out reports/
+    python ex3_report.py cohorts/ --format json --out term1.json --workers 4 --top 5
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from ex3_records import check_records, read_records
+
+MARK_FILES = ('.txt', '.csv', '.jsonl', '.ndjson')
+COMPONENTS = ("cw1", "cw2", "cw3", "exam", "total")
+
+# ====================== Analysis ======================
+def component_stats(counts):
+    """min / max / mean / quartiles from a {mark: count} histogram (marks are small integers)."""
+    n = sum(counts.values())
+    if not n:
+        return {}
+    marks = sorted(counts)
+    mean = sum(m * c for m, c in counts.items()) / n
+    var = sum(c * (m - mean) ** 2 for m, c in counts.items()) / n
+
+    def quantile(q):
+        target, seen = q * (n - 1), 0
+        for m in marks:
+            seen += counts[m]
+            if seen > target:
+                return m
+        return marks[-1]
+
+    return {"min": marks[0], "q1": quantile(0.25), "median": quantile(0.5), "q3": quantile(0.75),
+            "max": marks[-1], "mean": round(mean, 2), "stdev": round(var ** 0.5, 2)}
+
+def analyse_file(path, top=10):
+    """
+    One streaming pass over a marks file: grades, top/bottom ranking and per-component
+    stats. Rows are validated exactly as ex3.py's import does; bad rows are skipped.
+    """
+    grades = Counter()
+    marks = {c: Counter() for c in COMPONENTS}
+    best, worst = [], []     # bounded heaps of (score, -code, code, name); worst holds -score
+    n = skipped = 0
+    pct_sum = 0.0
+
+    for _, s, error in check_records(read_records(path)):
+        if error:
+            skipped += 1   # malformed, out of range or a repeated code, as the app's import rejects it
+            continue
+        n += 1
+        p = s.percentage()
+        pct_sum += p
+        grades[s.grade()[0]] += 1
+        for c, v in zip(COMPONENTS, (*s.cw, s.exam, s.total_score())):
+            marks[c][v] += 1
+        entry = (s.total_score(), -s.code, s.code, s.name)
+        if len(best) < top: heapq.heappush(best, entry)
+        else: heapq.heappushpop(best, entry)
+        neg = (-entry[0], -s.code, s.code, s.name)
+        if len(worst) < top: heapq.heappush(worst, neg)
+        else: heapq.heappushpop(worst, neg)
+
+    def ranked(heap, sign):
+        return [{"code": code, "name": name, "total": sign * score, "percentage": round(sign * score / 160 * 100, 1)}
+                for score, _, code, name in sorted(heap, reverse=True)]
+
+    return {
+        "file": os.path.basename(path),
+        "students": n,
+        "skipped": skipped,
+        "average": round(pct_sum / n, 2) if n else 0.0,
+        "grades": {g: grades[g] for g in "ABCDF"},
+        "components": {c: component_stats(marks[c]) for c in COMPONENTS},
+        "top": ranked(best, 1),
+        "bottom": ranked(worst, -1),
+    }
+
+def analyse_all(paths, top=10, workers=None):
+    """Analyses every file, spreading several files over a process pool."""
+    if len(paths) == 1 or workers == 1:
+        return [analyse_file(p, top) for p in paths]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(analyse_file, paths, [top] * len(paths)))
+
+# ====================== Output ======================
+def write_json(reports, out):
+    if out == "-":
+        json.dump(reports, sys.stdout, indent=2)
+        print()
+        return
+    with open(out, 'w', encoding='utf-8') as f:
+        json.dump(reports, f, indent=2)
+
+def write_csv(reports, out):
+    """Writes summary.csv (one row per cohort) and rankings.csv into the `out` directory."""
+    os.makedirs(out, exist_ok=True)
+    with open(os.path.join(out, "summary.csv"), 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["file", "students", "skipped", "average", *"ABCDF",
+                    *(f"{c}_{k}" for c in COMPONENTS for k in ("mean", "median", "stdev"))])
+        for r in reports:
+            comps = r["components"]
+            w.writerow([r["file"], r["students"], r["skipped"], r["average"], *r["grades"].values(),
+                        *(comps[c].get(k, "") for c in COMPONENTS for k in ("mean", "median", "stdev"))])
+    with open(os.path.join(out, "rankings.csv"), 'w', newline='', encoding='utf-8') as f:
+        w = csv.writer(f)
+        w.writerow(["file", "list", "rank", "code", "name", "total", "percentage"])
+        for r in reports:
+            for which in ("top", "bottom"):
+                for i, s in enumerate(r[which], 1):
+                    w.writerow([r["file"], which, i, s["code"], s["name"], s["total"], s["percentage"]])
+
+# ====================== Command Line ======================
+def collect_paths(targets):
+    paths = []
+    for t in targets:
+        if os.path.isdir(t):
+            paths += sorted(os.path.join(t, f) for f in os.listdir(t) if f.lower().endswith(MARK_FILES))
+        else:
+            paths.append(t)
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Student marks reports without a GUI.")
+    parser.add_argument("targets", nargs="+", help="marks files and/or directories of cohort files")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--out", default="-", help="JSON file ('-' for stdout) or CSV output directory")
+    parser.add_argument("--top", type=int, default=10, help="students listed in each ranking")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size (default: all cores)")
+    args = parser.parse_args(argv)
+
+    paths = collect_paths(args.targets)
+    if not paths:
+        parser.error("no marks files found")
+    try:
+        reports = analyse_all(paths, args.top, args.workers)
+    except OSError as e:
+        print(f"Could not read marks file: {e}", file=sys.stderr)
+        return 1
+
+    if args.format == "json":
+        write_json(reports, args.out)
+    else:
+        write_csv(reports, "reports" if args.out == "-" else args.out)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ex1 import AdaptiveModel, ResultsStore
+
+
+class AdaptiveModelStoreTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "results.db")
+
+    def test_drift_carries_over_a_reload(self):
+        model = AdaptiveModel()
+        for _ in range(5):
+            model.update('+', 2, False, 3000)   # ('+', 2) falls through bad luck
+        for _ in range(100):
+            model.update('+', 1, True, 2000)    # ...and is not asked while ('+', 1) is
+        drifted = model.accuracy('+', 2)
+        self.assertGreater(drifted, model.cells[('+', 2)][1])
+
+        store = ResultsStore(self.path)
+        store.save_model("ann", model)
+        store.close()
+        loaded = ResultsStore(self.path).load_model("ann")
+        self.assertEqual(loaded.answered, 105)
+        self.assertAlmostEqual(loaded.accuracy('+', 2), drifted)
+
+        loaded.update('+', 1, True, 2000)   # the drift goes on in the new session
+        self.assertGreater(loaded.accuracy('+', 2), drifted)
+
+    def test_files_without_last_asked_are_upgraded(self):
+        db = sqlite3.connect(self.path)
+        db.execute("CREATE TABLE adaptive (player TEXT NOT NULL, op TEXT NOT NULL, digits INTEGER NOT NULL, "
+                   "answers INTEGER NOT NULL, accuracy REAL NOT NULL, latency_ms REAL, "
+                   "PRIMARY KEY (player, op, digits)) WITHOUT ROWID")
+        db.execute("INSERT INTO adaptive VALUES ('ann', '+', 2, 4, 0.5, 3000)")
+        db.commit()
+        db.close()
+        store = ResultsStore(self.path)
+        model = store.load_model("ann")
+        self.assertEqual((model.answered, model.accuracy('+', 2)), (0, 0.5))
+        model.update('+', 1, True)
+        store.save_model("ann", model)
+        self.assertEqual(store.load_model("ann").last_asked, {('+', 1): 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
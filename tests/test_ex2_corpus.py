@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ex2_corpus import JokeCorpus, parse_joke
+
+
+class JokeCorpusTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "jokes.txt")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("Why did the chicken cross the road?To get to the other side.\n"
+                    "not a joke\n"
+                    "why did the  chicken cross the road?  to get to the other side.\n"
+                    "What is a café?A place? Maybe.\n")
+
+    def test_parse_keeps_everything_after_the_first_question_mark(self):
+        self.assertEqual(parse_joke("What?Why? Because."), ("What?", "Why? Because."))
+        self.assertIsNone(parse_joke("?no setup"))
+
+    def test_compiled_corpus_is_deduplicated_and_reopened_from_disk(self):
+        corpus = JokeCorpus(self.path)
+        jokes = [("Why did the chicken cross the road?", "To get to the other side."),
+                 ("What is a café?", "A place? Maybe.")]
+        self.assertEqual(list(corpus), jokes)
+        self.assertEqual(corpus[-1], jokes[-1])
+        self.assertIsNotNone(JokeCorpus(self.path).open_corpus())   # the .corpus file matches the text
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("Knock knock?Who's there.\n")
+        self.assertEqual(len(JokeCorpus(self.path)), 3)   # a changed text file is recompiled
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import http.client
+import http.server
+import json
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from ex2 import JokeClient
+from ex2_server import JokeService
+
+
+def run_in_thread(start):
+    """Runs an asyncio server from `start(loop)` on its own loop; returns (port, stop)."""
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start(loop))
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        loop.call_soon_threadsafe(server.close)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+    return server.sockets[0].getsockname()[1], stop
+
+
+class JokeServerTest(unittest.TestCase):
+    def setUp(self):
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        path = shutil.copy(os.path.join(ROOT, "randomJokes.txt"), folder.name)
+        service = JokeService(path)
+        self.port, stop = run_in_thread(lambda loop: asyncio.start_server(service.handle, "127.0.0.1", 0))
+        self.addCleanup(stop)
+
+    def test_request_body_does_not_desync_keep_alive(self):
+        conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=5)
+        self.addCleanup(conn.close)
+        conn.request("POST", "/joke", body=b"x" * 100000)
+        response = conn.getresponse()
+        self.assertEqual(response.status, 405)
+        response.read()
+        conn.request("GET", "/health")   # same connection
+        response = conn.getresponse()
+        self.assertEqual(response.status, 200)
+        self.assertGreater(json.loads(response.read())["jokes"], 0)
+
+    def test_unreadable_body_length_is_refused(self):
+        with socket.create_connection(("127.0.0.1", self.port), timeout=5) as sock:
+            sock.sendall(b"POST /joke HTTP/1.1\r\nHost: x\r\nContent-Length: lots\r\n\r\n")
+            reply = sock.makefile("rb").read()
+        self.assertTrue(reply.startswith(b"HTTP/1.1 400 "))
+        self.assertIn(b"Connection: close", reply)
+
+
+class JokeClientHealthTest(unittest.TestCase):
+    def test_a_service_that_answers_health_with_an_error_is_not_used(self):
+        class Down(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = b'{"error": "down for maintenance"}'   # valid JSON, but a 500
+                self.send_response(500)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+        server = http.server.HTTPServer(("127.0.0.1", 0), Down)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        with self.assertRaises(OSError):
+            JokeClient(f"127.0.0.1:{server.server_address[1]}", timeout=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
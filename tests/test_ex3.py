@@ -0,0 +1,130 @@
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def import_headless_ex3():
+    """Imports a fresh ex3 with tkinter replaced by mocks, so the app can be built without a display."""
+    tk = mock.MagicMock()
+    modules = {"tkinter": tk, **{f"tkinter.{n}": getattr(tk, n) for n in ("ttk", "messagebox", "simpledialog", "filedialog")}}
+    with mock.patch.dict(sys.modules, modules):
+        sys.modules.pop("ex3", None)
+        ex3 = importlib.import_module("ex3")
+        sys.modules.pop("ex3", None)
+    return ex3, tk
+
+
+class InstrumentedStartupTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.addCleanup(self.folder.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.folder.name)
+        self.addCleanup(os.chdir, cwd)
+        with open("studentMarks.txt", "w") as f:
+            f.write("2\n1001,Ann Lee,10,12,14,60\n1002,Bob Ray,5,6,7,40\n")
+
+    def test_profile_startup_builds_the_app(self):
+        # Same wiring as `python ex3.py --profile`: load_students is wrapped before the app exists
+        ex3, tk = import_headless_ex3()
+        instr = ex3.Instrumentation()
+        with mock.patch.object(ex3, "load_students", instr.wrap("load_students", ex3.load_students, records=len)):
+            app = ex3.StudentManagerApp(tk.Tk(), instr)
+        self.assertEqual(instr.samples[0][0], "load_students")
+        self.assertEqual(instr.samples[0][2], 2)
+
+        app.status.config.reset_mock()
+        app.display_students(app.students)
+        name, _, records, ops = instr.samples[-1]
+        self.assertEqual((name, records), ("display_students", 2))
+        self.assertGreater(ops, 0)
+        app.status.config.assert_called()
+        app.saver.close()
+
+
+class CheckRecordsTest(unittest.TestCase):
+    def test_each_row_gets_its_first_problem(self):
+        import ex3_records
+        rows = [(1, ["1001", "Ann Lee", "10", "12", "14", "60"]),
+                (2, None),
+                (3, ["1002", "Bob"]),
+                (4, ["1003", "Cy", "x", "1", "1", "50"]),
+                (5, ["1004", "Di", "21", "1", "1", "101"]),
+                (6, ["1005", "Ed, Jr", "1", "1", "1", "50"]),
+                (7, ["1001", "Ann Again", "1", "1", "1", "50"]),
+                (8, ["1500", "Fay", "1", "1", "1", "50"])]
+        with mock.patch.object(ex3_records, "VALIDATE_BATCH", 3):   # results must not depend on batch edges
+            results = [(n, s and s.code, error) for n, s, error in ex3_records.check_records(rows, {1500})]
+        self.assertEqual(results, [(1, 1001, None),
+                                   (2, None, "not a valid record"),
+                                   (3, None, "expected 6 fields"),
+                                   (4, None, "marks and code must be whole numbers"),
+                                   (5, None, "out of range: cw1, exam"),
+                                   (6, None, "name is empty or contains a comma"),
+                                   (7, None, "duplicate student code 1001"),
+                                   (8, None, "duplicate student code 1500")])
+
+
+class NameIndexTest(unittest.TestCase):
+    def test_short_queries_rank_word_starts_first_and_follow_edits(self):
+        ex3, _ = import_headless_ex3()
+        names = {1001: "Jo", 1002: "Ann Johnson", 1003: "John Curry", 1004: "Benjamin Ojo", 1005: "Sam Lee"}
+        students = {code: ex3.Student(code, name, 1, 1, 1, 1) for code, name in names.items()}
+        index = ex3.NameIndex(students.values())
+        self.assertEqual([s.code for s in index.search("jo")], [1001, 1003, 1002, 1004])
+        self.assertEqual([s.code for s in index.search("J", limit=2)], [1001, 1003])
+        self.assertEqual([s.code for s in index.search("e")], [1004, 1005])
+
+        index.remove(1001)
+        students[1005].name = "Joe Lee"
+        index.update(students[1005])
+        self.assertEqual([s.code for s in index.search("jo")], [1005, 1003, 1002, 1004])
+
+
+class MarksWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.ex3, _ = import_headless_ex3()
+        folder = tempfile.TemporaryDirectory()
+        self.addCleanup(folder.cleanup)
+        self.path = os.path.join(folder.name, "marks.txt")
+        self.write("1\n1001,Ann Lee,10,12,14,60\n")
+        self.watcher = self.ex3.MarksWatcher(self.path, list(self.ex3.iter_students(self.path)))
+        self.write("1\n1001,Ann Lee,10,12,14,61\n")
+        os.utime(self.path, ns=(0, 0))   # a signature the watcher has not seen
+
+    def write(self, text):
+        with open(self.path, "w") as f:
+            f.write(text)
+
+    def test_poll_skips_a_locked_file_and_retries(self):
+        with self.ex3.file_lock(self.path):
+            self.assertIsNone(self.watcher.poll())
+        self.assertEqual(self.watcher.poll(), ({1001: "1001,Ann Lee,10,12,14,61"}, []))
+        self.assertIsNone(self.watcher.poll())
+
+    def test_poll_retries_after_a_failed_read(self):
+        with mock.patch.object(self.ex3, "read_record_lines", side_effect=OSError("disk")):
+            self.assertRaises(OSError, self.watcher.poll)
+        self.assertEqual(self.watcher.poll(), ({1001: "1001,Ann Lee,10,12,14,61"}, []))
+
+
+class HeadlessReportTest(unittest.TestCase):
+    def test_report_runs_without_tkinter(self):
+        # tkinter is made unimportable in the child, as on a server without Tk
+        script = ("import runpy, sys; sys.modules['tkinter'] = None; "
+                  "sys.argv = ['ex3_report.py', 'studentMarks.txt', '--workers', '1']; "
+                  "runpy.run_path('ex3_report.py', run_name='__main__')")
+        out = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+        self.assertEqual(json.loads(out.stdout)[0]["file"], "studentMarks.txt")
+
+
+if __name__ == "__main__":
+    unittest.main()